@@ -1,5 +1,6 @@
 
 class Instruction:
+    __slots__ = ('_cell', '_color', '_text', '_text_color')
 
     _cell : tuple[int, int]
     """ Cellule (x, y) ciblée par l'instruction """
@@ -35,6 +36,7 @@ class Instruction:
         return f'cell={self.get_cell()},color={self.get_color()},text={self.get_text()},text_color={self.get_text_color()}'
 
 class InstructionSet:
+    __slots__ = ('_group_id', '_instructions')
 
     _group_id: str | None
     """ Group id de l'instruction : caractères alphanumériques, tiret (-) et underscore (_)"""
@@ -1,4 +1,5 @@
 import re
+import sys
 
 from instruction_parser_module.instruction import Instruction
 from instruction_parser_module.instruction import InstructionSet
@@ -13,6 +14,9 @@ INSTRUCTION_PATTERN=f"^{INSTRUCTION_START}\\(({CELL_PATTERN})(,{COLOR_PATTERN})?
 
 INSTRUCTION_REGEX = re.compile(INSTRUCTION_PATTERN)
 
+# Cells and colors repeat a lot across instructions: share one object for each of them
+CELLS = {(x, y): (x, y) for x in range(31) for y in range(21)}
+
 def parse_line(line) -> tuple[str, Instruction] | tuple[None,None]:
 
     match = INSTRUCTION_REGEX.match(line)
@@ -33,7 +37,10 @@ def parse_line(line) -> tuple[str, Instruction] | tuple[None,None]:
     if not color and not text:
         return None, None
 
-    return group, Instruction((cell_x, cell_y), color, text, text_color)
+    return group, Instruction(CELLS[(cell_x, cell_y)],
+                              sys.intern(color) if color else color,
+                              text,
+                              sys.intern(text_color) if text_color else text_color)
 
 def parse_logs(lines: list[str]) -> list[InstructionSet]:
     if not lines:
@@ -3,6 +3,7 @@ import sys
 import time
 
 # Performance ratio : 1/(50% quartile of benchmark in 1/1000 of ms)
+# The simulator measures the host's score itself (simulator_module/ai/calibration.py, "calibrate_host" config)
 CODINGAME_SCORE=1/250
 H0ST_SCORE=1/190
 
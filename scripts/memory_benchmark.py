@@ -0,0 +1,63 @@
+"""
+Measures the memory kept by a fully played game: states, player turns and parsed paint instructions.
+Run from the repository root: python -m scripts.memory_benchmark [paint_lines_per_step] [keyframe_interval]
+"""
+import sys
+import tracemalloc
+
+from instruction_parser_module import parser
+from simulator_module.game.game import Game
+from simulator_module.game.player_turn import PlayerTurn
+from simulator_module.util.logger import Logger
+
+QUADRANT_WIDTH = 15
+QUADRANT_HEIGHT = 10
+
+
+def snake_moves() -> list[str]:
+    """ Moves filling a whole quadrant row by row, starting from its top left corner """
+    moves = []
+    for row in range(QUADRANT_HEIGHT):
+        moves += ['RIGHT' if row % 2 == 0 else 'LEFT'] * (QUADRANT_WIDTH - 1)
+        if row < QUADRANT_HEIGHT - 1:
+            moves.append('DOWN')
+    return moves
+
+
+def paint_lines(step: int, nb_lines: int) -> list[str]:
+    return [f'#PAINT([{i % 30},{(i + step) % 20}],color=#FE3,text="{step}",group=g{i % 8})' for i in range(nb_lines)]
+
+
+def play(paint_lines_per_step: int, keyframe_interval: int | None):
+    corners = [(0, 0), (QUADRANT_WIDTH, 0), (0, QUADRANT_HEIGHT), (QUADRANT_WIDTH, QUADRANT_HEIGHT)]
+    if keyframe_interval:
+        game = Game(corners, Logger(), keyframe_interval=keyframe_interval)
+    else:
+        game = Game(corners, Logger())
+    instructions_by_step = []
+    moves = snake_moves()
+    for (turn, move) in enumerate(moves):
+        for player in range(len(corners)):
+            game.move_player(player, PlayerTurn(player, turn, move, 0.001))
+            instructions_by_step.append(parser.parse_logs(paint_lines(len(instructions_by_step), paint_lines_per_step)))
+    return game, instructions_by_step
+
+
+def main():
+    args = sys.argv[1:]
+    paint_lines_per_step = int(args[0]) if len(args) > 0 else 100
+    keyframe_interval = int(args[1]) if len(args) > 1 else None
+
+    tracemalloc.start()
+    game, instructions_by_step = play(paint_lines_per_step, keyframe_interval)
+    (current, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    steps = len(game.get_states())
+    print(f"Steps: {steps} - paint lines per step: {paint_lines_per_step} - keyframe interval: {keyframe_interval}")
+    print(f"Retained: {current / 1024 / 1024:.2f} MiB ({current / steps:.0f} bytes per step)")
+    print(f"Peak: {peak / 1024 / 1024:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,50 @@
 import os
-import queue
-import threading
 import time
+from functools import lru_cache
 from subprocess import Popen, PIPE
-from typing import IO, AnyStr
 
-from simulator_module.game.player_turn import PlayerTurn
+from simulator_module.ai.cpu import ProcessCpuClock, set_affinity
+from simulator_module.ai.io_loop import IOLoop, Pipe
+from simulator_module.ai.launchers import get_registry
+from simulator_module.ai.log_store import LogStore, decode_logs
+from simulator_module.ai.pool import BotPool
+from simulator_module.ai.zygote import Zygote, ZygoteProcess
+from simulator_module.game.player_turn import PlayerTurn, Move
 from simulator_module.util.logger import Logger
 
-class LogAppender:
-    def __init__(self, stderr: IO[AnyStr], logger: Logger):
-        self._stderr = stderr
-        self._logs = queue.Queue()
-        self._logger = logger
-
-    def start(self):
-        threading.Thread(target=self._read_logs, daemon=True).start()
+MOVES = [Move.UP, Move.DOWN, Move.LEFT, Move.RIGHT]
+# CodinGame time limits to answer, in seconds
+FIRST_TURN_TIMEOUT = 1.0
+TURN_TIMEOUT = 0.1
 
-    def _read_logs(self):
-        self._logger.log("Start reading logs...")
-        for line in iter(self._stderr.readline, ""):
-            self._logs.put(line.rstrip())
-        self._logger.log("Stopped reading logs")
+@lru_cache(maxsize=256)
+def encode_players_info(players_infos: tuple[tuple[int, int, int, int], ...]) -> bytes:
+    """ Encoded player lines of a turn: every AI asked on the same state shares the same block """
+    return "".join(f"{x0} {y0} {x1} {y1}\n" for (x0, y0, x1, y1) in players_infos).encode('utf-8')
 
-    def retrieve_logs(self) -> list[str]:
-        logs = []
-        while not self._logs.empty():
-            logs.append(self._logs.get(block=False))
-        return logs
-
-class AI:
+class BaseAI:
+    """
+    What every AI driver shares, whatever the way it talks to its bot: identity, time limits and per-turn logs.
+    """
     _path: str
-    _process: Popen
 
     _initial_coords: tuple[int, int]
     _player_id: int
     _running: bool
     _turn: int
 
-    _logs: list[list[str]]
-
+    _logs: LogStore
 
-    def __init__(self, player_id, path: str, initial_coords: tuple[int, int], log_directory: str | None, logger: Logger):
+    def __init__(self, player_id, path: str, initial_coords: tuple[int, int], log_directory: str | None, logger: Logger,
+                 first_turn_timeout: float = FIRST_TURN_TIMEOUT, turn_timeout: float = TURN_TIMEOUT,
+                 ipc_baseline_ns: int = 0, log_store: LogStore | None = None, cpus: list[int] | None = None,
+                 host_factor: float = 1.0):
         self._player_id = player_id
+        self._ipc_baseline_ns = ipc_baseline_ns
+        # Time limits are CodinGame's: they are scaled to the speed of this host
+        self._host_factor = host_factor
+        self._first_turn_timeout = first_turn_timeout * host_factor
+        self._turn_timeout = turn_timeout * host_factor
         self._logger = logger
         self._path = path
         self._initial_coords = initial_coords
@@ -51,96 +53,197 @@ class AI:
             self._log_file = open(f'{log_directory}/{self.get_name()}.log', 'wb')
         else:
             self._log_file = None
+        # Unbounded in-memory store by default, see LogStore for a memory budget
+        self._logs = log_store if log_store is not None else LogStore()
+        self._running = False
+        # CPUs the bot is pinned to, and the clock of its CPU time once started
+        self._cpus = cpus
+        self._cpu_clock: ProcessCpuClock | None = None
 
-        self._process = Popen(self.path_to_program_call(path), stdout=PIPE, stdin=PIPE, stderr=PIPE, text=True)
-        self._logs = []
-        self._log_appender = LogAppender(self._process.stderr, self._logger)
-        self._log_appender.start()
+    def get_name(self):
+        return f"{self._player_id}_{self._path.split('/')[-1].split('.')[0]}"
 
-        self._running = True
+    def get_logs_at_turn(self, turn: int) -> list[str] | None:
+        return self._logs.get_logs(turn)
 
-    def ask(self, nb_players, players_infos: list[tuple[int,int,int,int]]) -> PlayerTurn:
-        self._write_settings(nb_players)
-        for player_id, player_info in enumerate(players_infos):
-            self._write_player_info(player_info[0], player_info[1], player_info[2], player_info[3])
+    def get_stderr_at_turn(self, turn: int) -> bytes | None:
+        return self._logs.get(turn)
 
-        before = time.time()
-        try:
-            move = self._read_move()
-        except Exception as e:
-            self._logger.log(f"Error reading move, defaults to moving down: {e}")
-            move = 'DOWN'
-        finally:
-            after = time.time()
+    def close_logs(self):
+        self._logs.close()
 
-        elapsed_time = after - before
-        self._read_logs()
-        self._write_logs(len(self._logs)-1)
+    def path_to_program_call(self, path:str) -> list[str]:
+        return get_registry().command(path)
+
+    def _encode_turn_input(self, nb_players, players_infos: list[tuple[int,int,int,int]]) -> bytes:
+        settings = f"{nb_players} {self._player_id}\n".encode('utf-8')
+        return settings + encode_players_info(tuple(players_infos))
+
+    def _current_timeout(self) -> float:
+        return self._first_turn_timeout if self._turn == 0 else self._turn_timeout
+
+    def _parse_move(self, line: str) -> Move:
+        return Move(line) if line in MOVES else Move.DEATH
+
+    def _start_cpu_clock(self, pid: int, thread_id: int | None = None):
+        if self._cpus:
+            set_affinity(pid if thread_id is None else thread_id, self._cpus, self._logger)
+        self._cpu_clock = ProcessCpuClock(pid, thread_id)
+
+    def _read_cpu_clock(self) -> int | None:
+        return self._cpu_clock.read() if self._cpu_clock is not None else None
+
+    def _cpu_time_since(self, cpu_start: int | None) -> int | None:
+        cpu_end = self._read_cpu_clock()
+        return cpu_end - cpu_start if cpu_start is not None and cpu_end is not None else None
+
+    def _stop_cpu_clock(self):
+        if self._cpu_clock is not None:
+            self._cpu_clock.close()
 
-        player_turn = PlayerTurn(self._player_id, self._turn, move, elapsed_time)
+    def _log_timeout(self, error: Exception, cpu_ns: int | None):
+        # Telling the bot's own work from host contention: a bot that used little CPU time was not scheduled
+        cpu_time = f" (CPU time: {cpu_ns / 1e6:.0f} ms)" if cpu_ns is not None else ""
+        self._logger.log(f"AI {self._player_id} timed out at turn {self._turn}, it is eliminated: {error}{cpu_time}")
+
+    def _end_turn(self, move: Move, timed_out: bool, write_start: int, write_end: int, first_byte: int | None,
+                  read_end: int, stderr: bytes | bytearray, cpu_ns: int | None = None) -> PlayerTurn:
+        """ Stores the logs of the turn and builds its PlayerTurn, timestamps being perf_counter_ns() values """
+        first_byte = first_byte or read_end
+        self._logs.append(stderr)
+        self._write_logs(len(self._logs)-1, stderr)
+
+        player_turn = PlayerTurn(self._player_id, self._turn, move, (read_end - write_end) / 1e9, timed_out,
+                                 write_end - write_start, first_byte - write_end, read_end - first_byte,
+                                 self._ipc_baseline_ns, cpu_ns, self._host_factor)
         self._turn += 1
         return player_turn
 
-    def stop(self):
-        if not self._running:
+    def _write_logs(self, turn, stderr: bytes | bytearray):
+        if not self._log_file:
             return
-        self._process.kill()
-        self._process.wait()
+        logs = decode_logs(stderr)
+        self._log_file.write(f"=== Logs at turn {turn} ===\n".encode('utf-8'))
+        self._log_file.write(os.linesep.join(logs).encode('utf-8'))
+        self._log_file.flush()
+
+    def _close_log_file(self):
         if self._log_file:
             self._log_file.close()
-        self._running = False
-
-    def get_name(self):
-        return f"{self._player_id}_{self._path.split('/')[-1].split('.')[0]}"
 
-    def get_logs_at_turn(self, turn: int) -> list[str] | None:
-        if not 0 <= turn < len(self._logs):
-            return None
-        return self._logs[turn]
 
-    def path_to_program_call(self, path:str) -> list[str]:
-        if path.endswith(".py"):
-            return ['python', path]
-        elif path.endswith(".java"):
-            return ['/var/home/guiguinodzo/.sdkman/candidates/java/current/bin/java', path]
+class AI(BaseAI):
+    _process: Popen | ZygoteProcess
+
+    def __init__(self, player_id, path: str, initial_coords: tuple[int, int], log_directory: str | None, logger: Logger,
+                 first_turn_timeout: float = FIRST_TURN_TIMEOUT, turn_timeout: float = TURN_TIMEOUT,
+                 ipc_baseline_ns: int = 0, log_store: LogStore | None = None, cpus: list[int] | None = None,
+                 host_factor: float = 1.0, io_loop: IOLoop | None = None, zygote: Zygote | None = None,
+                 pool: BotPool | None = None):
+        super().__init__(player_id, path, initial_coords, log_directory, logger, first_turn_timeout, turn_timeout,
+                         ipc_baseline_ns, log_store, cpus, host_factor)
+
+        # A pooled bot is leased for this game and given back to the pool when stopped, unless it timed out
+        self._pool = pool
+        process = pool.lease(path) if pool is not None else None
+        if process is not None:
+            self._process = process
+        elif zygote is not None and path.endswith(".py"):
+            self._process = zygote.spawn(path)
         else:
-            return [path]
+            self._process = Popen(self.path_to_program_call(path), stdout=PIPE, stdin=PIPE, stderr=PIPE, bufsize=0)
+        self._start_cpu_clock(self._process.pid)
+        self._owns_io_loop = io_loop is None
+        self._io_loop = io_loop if io_loop is not None else IOLoop()
+        self._stdout = Pipe(f"stdout of AI {player_id}", self._process.stdout)
+        self._stderr = Pipe(f"stderr of AI {player_id}", self._process.stderr)
+        self._io_loop.register(self._stdout)
+        self._io_loop.register(self._stderr)
+
+        self._running = True
+
+    def ask(self, nb_players, players_infos: list[tuple[int,int,int,int]]) -> PlayerTurn:
+        cpu_start = self._read_cpu_clock()
+        write_start = time.perf_counter_ns()
+        write_end = write_start
+        timed_out = None
+        exited = None
+        try:
+            self._write_turn_input(nb_players, players_infos)
+            write_end = time.perf_counter_ns()
+            # The whole turn input is written with a single write: the decision clock only measures the bot's answer
+            move = self._read_move()
+        except TimeoutError as e:
+            move = Move.DEATH
+            timed_out = e
+        except (EOFError, OSError) as e:
+            # Closed stdout or stdin: the bot exited, as if it had answered an invalid move
+            self._logger.log(f"AI {self._player_id} exited, it is eliminated: {e}")
+            move = Move.DEATH
+            exited = e
+        except Exception as e:
+            self._logger.log(f"Error reading move, defaults to moving down: {e}")
+            move = Move.DOWN
+        finally:
+            read_end = time.perf_counter_ns()
+        cpu_ns = self._cpu_time_since(cpu_start)
+        if timed_out:
+            self._log_timeout(timed_out, cpu_ns)
+
+        player_turn = self._end_turn(move, timed_out is not None, write_start, write_end, self._stdout.first_byte_ns,
+                                     read_end, self._read_logs(), cpu_ns)
+        if timed_out or exited:
+            # Its late answer would leak into the next game: a bot that timed out is never reused
+            self._pool = None
+            self.stop()
+        return player_turn
 
-    def _write_settings(self, nb_players):
+    def stop(self):
         if not self._running:
-            self._logger.log(f"Cannot write settings because AI {self._player_id} is not running")
             return
+        # Anything still unread on stdout is an answer to no turn: such a bot cannot be reused either
+        if self._pool is not None and (self._io_loop.drain(self._stdout) or self._stdout.closed):
+            self._pool = None
+        self._io_loop.unregister(self._stdout)
+        self._io_loop.unregister(self._stderr)
+        self._stop_cpu_clock()
+        if self._owns_io_loop:
+            self._io_loop.close()
+        if self._pool is not None:
+            self._pool.release(self._path, self._process)
+        else:
+            self._process.kill()
+            self._process.wait()
+            for stream in (self._process.stdin, self._process.stdout, self._process.stderr):
+                try:
+                    stream.close()
+                except OSError:
+                    pass
+        self._close_log_file()
+        self._running = False
 
-        self._write(f"{nb_players} {self._player_id}\n")
-
-    def _write_player_info(self, x0, y0, x1, y1):
+    def _write_turn_input(self, nb_players, players_infos: list[tuple[int,int,int,int]]):
         if not self._running:
-            self._logger.log(f"Cannot write player info because AI {self._player_id} is not running")
+            self._logger.log(f"Cannot write turn input because AI {self._player_id} is not running")
             return
-        self._write(f"{x0} {y0} {x1} {y1}\n")
+
+        self._write(self._encode_turn_input(nb_players, players_infos))
 
     def _read_move(self):
         if not self._running:
             self._logger.log(f"Cannot read move because AI {self._player_id} is not running, defaults to DOWN")
-            return 'DOWN'
+            return Move.DOWN
 
-        move = self._read()
-        return move if move in ['UP', 'DOWN', 'LEFT', 'RIGHT'] else 'DEATH'
+        return self._parse_move(self._read())
 
-    def _read_logs(self):
-        self._logs.append(self._log_appender.retrieve_logs() + ['\n'])
+    def _read_logs(self) -> bytes | bytearray:
+        if not self._running:
+            return b""
+        return self._io_loop.drain(self._stderr)
 
     def _read(self):
-        return self._process.stdout.readline().replace('\n', '')
+        return self._io_loop.read_line(self._stdout, self._current_timeout())
 
-    def _write(self, line):
-        self._process.stdin.write(line)
+    def _write(self, data: bytes):
+        self._process.stdin.write(data)
         self._process.stdin.flush()
-
-    def _write_logs(self, turn):
-        if not self._log_file:
-            return
-        logs = self._logs[turn]
-        self._log_file.write(f"=== Logs at turn {turn} ===\n".encode('utf-8'))
-        self._log_file.write(os.linesep.join(logs).encode('utf-8'))
-        self._log_file.flush()
@@ -0,0 +1,114 @@
+import asyncio
+import time
+from asyncio.subprocess import PIPE, Process
+
+from simulator_module.ai.ai import BaseAI, FIRST_TURN_TIMEOUT, TURN_TIMEOUT
+from simulator_module.ai.log_store import LogStore
+from simulator_module.game.player_turn import PlayerTurn, Move
+from simulator_module.util.logger import Logger
+
+READ_SIZE = 65536
+
+
+class AsyncAI(BaseAI):
+    """
+    AI driven from an asyncio event loop, so that a single loop can multiplex the bots of many games.
+    start() must be awaited before the first ask().
+    The answer is read with StreamReader.readline: the first byte is not observed, so wait_ns covers the whole
+    decision and read_ns is 0.
+    """
+    _process: Process | None
+
+    def __init__(self, player_id, path: str, initial_coords: tuple[int, int], log_directory: str | None, logger: Logger,
+                 first_turn_timeout: float = FIRST_TURN_TIMEOUT, turn_timeout: float = TURN_TIMEOUT,
+                 ipc_baseline_ns: int = 0, log_store: LogStore | None = None, cpus: list[int] | None = None,
+                 host_factor: float = 1.0):
+        super().__init__(player_id, path, initial_coords, log_directory, logger, first_turn_timeout, turn_timeout,
+                         ipc_baseline_ns, log_store, cpus, host_factor)
+        self._process = None
+        self._stderr = bytearray()
+        self._stderr_task = None
+
+    async def start(self):
+        self._process = await asyncio.create_subprocess_exec(*self.path_to_program_call(self._path),
+                                                             stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        self._stderr_task = asyncio.create_task(self._read_stderr())
+        self._start_cpu_clock(self._process.pid)
+        self._running = True
+
+    async def ask(self, nb_players, players_infos: list[tuple[int,int,int,int]]) -> PlayerTurn:
+        cpu_start = self._read_cpu_clock()
+        write_start = time.perf_counter_ns()
+        write_end = write_start
+        timed_out = None
+        exited = None
+        try:
+            await self._write_turn_input(nb_players, players_infos)
+            write_end = time.perf_counter_ns()
+            move = await self._read_move()
+        except TimeoutError:
+            move = Move.DEATH
+            timed_out = TimeoutError(f"No answer within {self._current_timeout() * 1000:.0f} ms")
+        except (EOFError, OSError) as e:
+            # Closed stdout or stdin: the bot exited, as if it had answered an invalid move
+            self._logger.log(f"AI {self._player_id} exited, it is eliminated: {e}")
+            move = Move.DEATH
+            exited = e
+        except Exception as e:
+            self._logger.log(f"Error reading move, defaults to moving down: {e}")
+            move = Move.DOWN
+        finally:
+            read_end = time.perf_counter_ns()
+        cpu_ns = self._cpu_time_since(cpu_start)
+        if timed_out:
+            self._log_timeout(timed_out, cpu_ns)
+
+        player_turn = self._end_turn(move, timed_out is not None, write_start, write_end, None, read_end,
+                                     await self._read_logs(), cpu_ns)
+        if timed_out or exited:
+            self.stop()
+        return player_turn
+
+    def stop(self):
+        """ Kills the bot, wait_closed() waits for the process to be reaped """
+        if not self._running:
+            return
+        self._process.kill()
+        self._stop_cpu_clock()
+        self._close_log_file()
+        self._running = False
+
+    async def wait_closed(self):
+        if self._process is None:
+            return
+        await self._process.wait()
+        if self._stderr_task:
+            await self._stderr_task
+
+    async def _write_turn_input(self, nb_players, players_infos: list[tuple[int,int,int,int]]):
+        if not self._running:
+            self._logger.log(f"Cannot write turn input because AI {self._player_id} is not running")
+            return
+        self._process.stdin.write(self._encode_turn_input(nb_players, players_infos))
+        await self._process.stdin.drain()
+
+    async def _read_move(self) -> Move:
+        if not self._running:
+            self._logger.log(f"Cannot read move because AI {self._player_id} is not running, defaults to DOWN")
+            return Move.DOWN
+
+        line = await asyncio.wait_for(self._process.stdout.readline(), self._current_timeout())
+        if not line:
+            raise EOFError("Standard output closed")
+        return self._parse_move(line.rstrip(b'\n').decode('utf-8', errors='replace'))
+
+    async def _read_logs(self) -> bytearray:
+        # Two loop iterations: one for the transport to read what is pending on stderr, one for _read_stderr
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        (logs, self._stderr) = (self._stderr, bytearray())
+        return logs
+
+    async def _read_stderr(self):
+        while data := await self._process.stderr.read(READ_SIZE):
+            self._stderr += data
@@ -0,0 +1,88 @@
+import json
+import os
+import platform
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+
+from simulator_module.ai.launchers import CACHE_DIRECTORY
+from simulator_module.util.logger import Logger
+
+# Median duration of the workload on CodinGame's arena, in µs, measured with scripts/benchmark.py
+CODINGAME_MEDIAN_US = 250
+CALIBRATION_FILE = os.path.join(CACHE_DIRECTORY, 'calibration.json')
+MEASURE_DURATION = 0.2
+
+# Global as DUMMY_ARRAY in scripts/benchmark.py: the time of its lookups is part of the reference duration
+WORKLOAD_ARRAY = [-1] * 600
+
+
+@dataclass(frozen=True, slots=True)
+class HostCalibration:
+    host_median_us: float
+    codingame_median_us: float = CODINGAME_MEDIAN_US
+
+    @property
+    def factor(self) -> float:
+        """ How much slower than CodinGame this host runs the same code: above 1 for a slower host """
+        return self.host_median_us / self.codingame_median_us
+
+
+def workload():
+    """ Same as dummy_operation in scripts/benchmark.py, which is run on CodinGame to get CODINGAME_MEDIAN_US """
+    for _ in range(10):
+        for index in range(len(WORKLOAD_ARRAY)):
+            WORKLOAD_ARRAY[index] = WORKLOAD_ARRAY[index] + 1
+
+
+def measure_host_median_us(duration: float = MEASURE_DURATION) -> float:
+    durations = []
+    end = time.perf_counter() + duration
+    while (before := time.perf_counter()) < end:
+        workload()
+        durations.append(time.perf_counter() - before)
+    return statistics.median(durations) * 1e6
+
+
+def host_key() -> str:
+    """ The workload's speed depends on the machine and on the interpreter running it """
+    return (f"{platform.node()}|{platform.machine()}|"
+            f"{platform.python_implementation()} {platform.python_version()}")
+
+
+_calibrations: dict[str, HostCalibration] = {}
+_calibration_lock = threading.Lock()
+
+
+def get_calibration(logger: Logger, calibration_file: str = CALIBRATION_FILE) -> HostCalibration:
+    """
+    Calibration of this host against CodinGame, measured once per machine and interpreter and cached in
+    `calibration_file`, then kept for the whole process.
+    """
+    with _calibration_lock:
+        if calibration_file in _calibrations:
+            return _calibrations[calibration_file]
+
+        key = host_key()
+        try:
+            with open(calibration_file, 'r') as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            cache = {}
+
+        if key in cache:
+            calibration = HostCalibration(cache[key])
+        else:
+            calibration = HostCalibration(measure_host_median_us())
+            cache[key] = calibration.host_median_us
+            try:
+                os.makedirs(os.path.dirname(calibration_file), exist_ok=True)
+                with open(calibration_file, 'w') as cache_file:
+                    json.dump(cache, cache_file, indent=4)
+            except OSError as e:
+                logger.log(f"Cannot save host calibration: {e}")
+        logger.log(f"Host calibration: workload median {calibration.host_median_us:.0f} µs, CodinGame "
+                   f"{calibration.codingame_median_us} µs, time limits scaled by {calibration.factor:.2f}")
+        _calibrations[calibration_file] = calibration
+        return calibration
@@ -0,0 +1,49 @@
+import os
+
+from simulator_module.util.logger import Logger
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+
+class ProcessCpuClock:
+    """
+    CPU time (user + system) consumed by a process, all threads included, or by one of its threads when `thread_id`
+    is set, read from /proc/<pid>/stat. The kernel reports it in clock ticks (usually 10 ms).
+    read() returns None where there is no procfs or once the process is gone.
+    """
+
+    def __init__(self, pid: int, thread_id: int | None = None):
+        path = f'/proc/{pid}/stat' if thread_id is None else f'/proc/{pid}/task/{thread_id}/stat'
+        try:
+            self._fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            self._fd = None
+
+    def read(self) -> int | None:
+        """ CPU time in ns """
+        if self._fd is None:
+            return None
+        try:
+            stat = os.pread(self._fd, 1024, 0)
+        except OSError:
+            return None
+        # The command name may contain spaces: fields are counted from its closing parenthesis, utime and stime
+        # being the 14th and 15th fields of the line
+        fields = stat[stat.rindex(b')') + 2:].split()
+        return (int(fields[11]) + int(fields[12])) * 1_000_000_000 // CLOCK_TICKS
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def set_affinity(pid: int, cpus: list[int], logger: Logger):
+    """ Pins the process to `cpus`, when the platform allows it. On Linux, `pid` can also be a thread id """
+    if not hasattr(os, 'sched_setaffinity'):
+        logger.log(f"CPU affinity is not supported on this platform, process {pid} is not pinned")
+        return
+    try:
+        os.sched_setaffinity(pid, cpus)
+    except OSError as e:
+        logger.log(f"Cannot pin process {pid} to CPUs {cpus}: {e}")
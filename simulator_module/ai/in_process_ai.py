@@ -0,0 +1,220 @@
+import io
+import os
+import runpy
+import sys
+import threading
+import time
+import traceback
+
+from simulator_module.ai.ai import BaseAI, FIRST_TURN_TIMEOUT, TURN_TIMEOUT
+from simulator_module.ai.log_store import LogStore
+from simulator_module.game.player_turn import PlayerTurn, Move
+from simulator_module.util.logger import Logger
+
+
+class BotStopped(BaseException):
+    """ Raised in a bot thread using its standard streams after its AI stopped, to unwind the bot """
+
+
+class Channel(io.TextIOBase):
+    """
+    In-memory text stream between the simulator and a bot thread, used in place of a pipe.
+    Writing to a closed channel raises BotStopped, reading from it returns what is left then ''.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[str] = []
+        self._condition = threading.Condition()
+        self._ended = False
+        self.first_write_ns: int | None = None
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        with self._condition:
+            if self._ended:
+                raise BotStopped()
+            if self.first_write_ns is None:
+                self.first_write_ns = time.perf_counter_ns()
+            self._chunks.append(text)
+            self._condition.notify_all()
+        return len(text)
+
+    def readline(self, size: int = -1, timeout: float | None = None) -> str:
+        """ Waits for a complete line, raises TimeoutError if there is none within `timeout` seconds """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        with self._condition:
+            while True:
+                data = "".join(self._chunks)
+                end = data.find('\n')
+                if end >= 0 or self._ended:
+                    line = data[:end + 1] if end >= 0 else data
+                    self._chunks = [data[len(line):]] if len(data) > len(line) else []
+                    return line
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No answer within {timeout * 1000:.0f} ms")
+                self._condition.wait(remaining)
+
+    def pop_all(self) -> str:
+        with self._condition:
+            data = "".join(self._chunks)
+            self._chunks = []
+            return data
+
+    def end(self):
+        """ Wakes up the readers and makes any further write raise BotStopped """
+        with self._condition:
+            self._ended = True
+            self._condition.notify_all()
+
+    def isatty(self) -> bool:
+        return False
+
+
+class _ThreadStreams(threading.local):
+    stdin: Channel | None = None
+    stdout: Channel | None = None
+    stderr: Channel | None = None
+
+
+_thread_streams = _ThreadStreams()
+_install_lock = threading.Lock()
+
+
+class _RedirectedStream:
+    """ Replaces a sys standard stream: bot threads see their channel, every other thread the original stream """
+
+    def __init__(self, name: str, original):
+        self._name = name
+        self._original = original
+
+    def _target(self):
+        channel = getattr(_thread_streams, self._name)
+        return self._original if channel is None else channel
+
+    def __getattr__(self, item):
+        return getattr(self._target(), item)
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def readline(self, size: int = -1) -> str:
+        return self._target().readline(size)
+
+    def flush(self):
+        return self._target().flush()
+
+
+def _install_redirections():
+    with _install_lock:
+        for name in ('stdin', 'stdout', 'stderr'):
+            if not isinstance(getattr(sys, name), _RedirectedStream):
+                setattr(sys, name, _RedirectedStream(name, getattr(sys, name)))
+
+
+class InProcessAI(BaseAI):
+    """
+    Trusted Python bot run by a thread of the simulator process, input() and print() being wired to in-memory
+    channels: no process start and no pipe round-trip, for quick local iterations and profiling.
+    Turns are timed and logs captured as with AI. The bot shares the interpreter (and the GIL) with the simulator, so
+    its decision times are only indicative. A thread cannot be killed: a bot that timed out or stopped is unwound the
+    next time it uses its standard streams.
+    Subinterpreters have no Python API on the supported Python versions, threads are the only in-process option.
+    """
+
+    def __init__(self, player_id, path: str, initial_coords: tuple[int, int], log_directory: str | None, logger: Logger,
+                 first_turn_timeout: float = FIRST_TURN_TIMEOUT, turn_timeout: float = TURN_TIMEOUT,
+                 ipc_baseline_ns: int = 0, log_store: LogStore | None = None, cpus: list[int] | None = None,
+                 host_factor: float = 1.0):
+        super().__init__(player_id, path, initial_coords, log_directory, logger, first_turn_timeout, turn_timeout,
+                         ipc_baseline_ns, log_store, cpus, host_factor)
+        self._stdin = Channel()
+        self._stdout = Channel()
+        self._stderr = Channel()
+        _install_redirections()
+        self._thread = threading.Thread(target=self._run_bot, name=f"AI {player_id}", daemon=True)
+        self._thread.start()
+        self._start_cpu_clock(os.getpid(), self._thread.native_id)
+        self._running = True
+
+    def ask(self, nb_players, players_infos: list[tuple[int,int,int,int]]) -> PlayerTurn:
+        cpu_start = self._read_cpu_clock()
+        write_start = time.perf_counter_ns()
+        self._write_turn_input(nb_players, players_infos)
+        write_end = time.perf_counter_ns()
+
+        timed_out = None
+        exited = None
+        try:
+            move = self._read_move()
+        except TimeoutError as e:
+            move = Move.DEATH
+            timed_out = e
+        except EOFError as e:
+            # The bot returned or raised: as a bot process that exited, it is eliminated
+            self._logger.log(f"AI {self._player_id} exited, it is eliminated: {e}")
+            move = Move.DEATH
+            exited = e
+        except Exception as e:
+            self._logger.log(f"Error reading move, defaults to moving down: {e}")
+            move = Move.DOWN
+        finally:
+            read_end = time.perf_counter_ns()
+        cpu_ns = self._cpu_time_since(cpu_start)
+        if timed_out:
+            self._log_timeout(timed_out, cpu_ns)
+
+        player_turn = self._end_turn(move, timed_out is not None, write_start, write_end, self._stdout.first_write_ns,
+                                     read_end, self._stderr.pop_all().encode('utf-8'), cpu_ns)
+        if timed_out or exited:
+            self.stop()
+        return player_turn
+
+    def stop(self):
+        if not self._running:
+            return
+        for channel in (self._stdin, self._stdout, self._stderr):
+            channel.end()
+        self._stop_cpu_clock()
+        self._close_log_file()
+        self._running = False
+
+    def _write_turn_input(self, nb_players, players_infos: list[tuple[int,int,int,int]]):
+        if not self._running:
+            self._logger.log(f"Cannot write turn input because AI {self._player_id} is not running")
+            return
+        self._stdout.first_write_ns = None
+        self._stdin.write(self._encode_turn_input(nb_players, players_infos).decode('utf-8'))
+
+    def _read_move(self) -> Move:
+        if not self._running:
+            self._logger.log(f"Cannot read move because AI {self._player_id} is not running, defaults to DOWN")
+            return Move.DOWN
+
+        line = self._stdout.readline(timeout=self._current_timeout())
+        if not line:
+            raise EOFError("Standard output closed")
+        return self._parse_move(line.rstrip('\n'))
+
+    def _run_bot(self):
+        _thread_streams.stdin = self._stdin
+        _thread_streams.stdout = self._stdout
+        _thread_streams.stderr = self._stderr
+        try:
+            runpy.run_path(self._path, run_name='__main__')
+        except (BotStopped, SystemExit):
+            pass
+        except BaseException:
+            # Same as the traceback a bot process writes on its stderr before exiting
+            try:
+                self._stderr.write(traceback.format_exc())
+            except BotStopped:
+                pass
+        finally:
+            self._stdout.end()
@@ -0,0 +1,151 @@
+import os
+import queue
+import selectors
+import threading
+import time
+from typing import IO
+
+READ_SIZE = 65536
+
+
+class Pipe:
+    """
+    Output pipe of a bot (stdout or stderr) and the bytes read from it but not consumed yet.
+    """
+    name: str
+    fd: int
+    buffer: bytearray
+    closed: bool
+    first_byte_ns: int | None
+
+    def __init__(self, name: str, stream: IO[bytes]):
+        self.name = name
+        self.fd = stream.fileno()
+        self.buffer = bytearray()
+        self.closed = False
+        self.first_byte_ns = None
+
+    def pop_line(self) -> bytes | None:
+        end = self.buffer.find(b'\n')
+        if end < 0:
+            return None
+        line = bytes(self.buffer[:end])
+        del self.buffer[:end + 1]
+        return line
+
+    def pop_all(self) -> bytearray:
+        """ Hands over the whole buffer without copying it """
+        (data, self.buffer) = (self.buffer, bytearray())
+        return data
+
+
+class IOLoop:
+    """
+    Single-threaded reader of the stdout and stderr of every bot of a simulation.
+    Waiting for the answer of one bot keeps reading the output of all the others, so no bot ever blocks on a full
+    pipe, and stderr is attributed to a turn deterministically: once a move is read, the bot's stderr is drained of
+    everything written before the move.
+    Pipes cannot be polled on Windows: there, one pump thread per pipe feeds the loop instead.
+    """
+
+    def __init__(self):
+        self._pipes: dict[int, Pipe] = {}
+        if os.name == 'nt':
+            self._selector = None
+            self._chunks = queue.Queue()
+        else:
+            self._selector = selectors.DefaultSelector()
+
+    def register(self, pipe: Pipe):
+        self._pipes[pipe.fd] = pipe
+        if self._selector is None:
+            threading.Thread(target=self._pump, args=(pipe,), daemon=True).start()
+        else:
+            os.set_blocking(pipe.fd, False)
+            self._selector.register(pipe.fd, selectors.EVENT_READ, pipe)
+
+    def unregister(self, pipe: Pipe):
+        if self._pipes.pop(pipe.fd, None) is None:
+            return
+        if self._selector is not None:
+            self._selector.unregister(pipe.fd)
+
+    def read_line(self, pipe: Pipe, timeout: float) -> str:
+        """ Returns the next line of `pipe`, raises TimeoutError if it is not complete within `timeout` seconds """
+        deadline = time.perf_counter() + timeout
+        pipe.first_byte_ns = time.perf_counter_ns() if pipe.buffer else None
+        while True:
+            line = pipe.pop_line()
+            if line is not None:
+                return line.decode('utf-8', errors='replace')
+            if pipe.closed:
+                raise EOFError(f"{pipe.name} closed")
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise TimeoutError(f"No answer within {timeout * 1000:.0f} ms")
+            self.poll(remaining)
+
+    def drain(self, pipe: Pipe) -> bytearray:
+        """ Reads everything already written to `pipe` without waiting, and returns the pending bytes """
+        if self._selector is None:
+            self.poll(0)
+        elif not pipe.closed and pipe.fd in self._pipes:
+            self._read(pipe, time.perf_counter_ns(), until_empty=True)
+        return pipe.pop_all()
+
+    def poll(self, timeout: float):
+        """ Reads the pipes that have data within `timeout` seconds """
+        if self._selector is None:
+            self._poll_chunks(timeout)
+            return
+        for (key, _) in self._selector.select(timeout):
+            self._read(key.data, time.perf_counter_ns())
+
+    def close(self):
+        for pipe in list(self._pipes.values()):
+            self.unregister(pipe)
+        if self._selector is not None:
+            self._selector.close()
+
+    def _read(self, pipe: Pipe, received_ns: int, until_empty: bool = False):
+        while True:
+            try:
+                data = os.read(pipe.fd, READ_SIZE)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b""
+            self._append(pipe, data, received_ns)
+            if not data or not until_empty:
+                return
+
+    def _append(self, pipe: Pipe, data: bytes, received_ns: int):
+        if not data:
+            pipe.closed = True
+            self.unregister(pipe)
+            return
+        if pipe.first_byte_ns is None:
+            pipe.first_byte_ns = received_ns
+        pipe.buffer += data
+
+    def _poll_chunks(self, timeout: float):
+        try:
+            (pipe, data) = self._chunks.get(timeout=timeout) if timeout > 0 else self._chunks.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            self._append(pipe, data, time.perf_counter_ns())
+            try:
+                (pipe, data) = self._chunks.get_nowait()
+            except queue.Empty:
+                return
+
+    def _pump(self, pipe: Pipe):
+        while True:
+            try:
+                data = os.read(pipe.fd, READ_SIZE)
+            except OSError:
+                data = b""
+            self._chunks.put((pipe, data))
+            if not data:
+                return
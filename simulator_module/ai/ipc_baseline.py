@@ -0,0 +1,45 @@
+import os
+import statistics
+import tempfile
+
+from simulator_module.ai.ai import AI
+from simulator_module.util.logger import Logger
+
+ECHO_BOT = """
+while True:
+    n, my_id = map(int, input().split())
+    for j in range(n):
+        input()
+    print("UP", flush=True)
+"""
+SAMPLES = 30
+
+_baseline_ns: int | None = None
+
+
+def measure_ipc_baseline(logger: Logger, samples: int = SAMPLES) -> int:
+    """
+    Median round-trip, in ns, of a turn played by a bot answering immediately.
+    It is what the pipes and process scheduling add to every measured decision time on this host.
+    Measured once per process.
+    """
+    global _baseline_ns
+    if _baseline_ns is not None:
+        return _baseline_ns
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "echo.py")
+        with open(path, 'w') as bot_file:
+            bot_file.write(ECHO_BOT)
+        ai = AI(0, path, (0, 0), None, logger)
+        try:
+            players_infos = [(0, 0, 0, 0)] * 4
+            # The first turn includes the interpreter startup
+            ai.ask(len(players_infos), players_infos)
+            round_trips = [ai.ask(len(players_infos), players_infos).duration for _ in range(samples)]
+        finally:
+            ai.stop()
+
+    _baseline_ns = int(statistics.median(round_trips) * 1e9)
+    logger.log(f"IPC round-trip baseline: {_baseline_ns / 1000:.1f} µs")
+    return _baseline_ns
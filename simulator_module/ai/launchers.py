@@ -0,0 +1,184 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable
+
+CACHE_DIRECTORY = os.environ.get('TRON_SIMULATOR_CACHE',
+                                 os.path.join(os.path.expanduser('~'), '.cache', 'codingame-tron-simulator'))
+COMPILE_TIMEOUT = 120
+
+
+class CompilationError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Launcher:
+    """
+    How to run the bots of a language. Commands are templates:
+    {source} is the bot's file, {artifact} the compiled program, {name} the file name without its extension, {main}
+    the entry point found in the artifact by `main`, {name} without it.
+    Without a compile command, the run command is applied to the source itself.
+    """
+    extensions: tuple[str, ...]
+    run: tuple[str, ...]
+    compile: tuple[str, ...] | None = None
+    # Command printing the compiler version, part of the artifact cache key
+    version: tuple[str, ...] | None = None
+    # Name of the artifact in its cache directory, a directory when it is ''
+    artifact: str = 'bot'
+    # Entry point of the compiled program, from the artifact and the file name without its extension
+    main: Callable[[str, str], str] | None = None
+
+
+def java_command(command: str) -> str:
+    java_home = os.environ.get('JAVA_HOME')
+    return os.path.join(java_home, 'bin', command) if java_home else command
+
+
+def java_main_class(artifact: str, name: str) -> str:
+    """
+    Class to run among the compiled classes of a Java bot: the one named after the file if it declares a main method,
+    else the first top-level class declaring one, else Player as on CodinGame, where the file name does not matter.
+    """
+    candidates = []
+    for class_file in sorted(os.listdir(artifact)):
+        (class_name, extension) = os.path.splitext(class_file)
+        if extension != '.class' or '$' in class_name:
+            continue
+        with open(os.path.join(artifact, class_file), 'rb') as compiled_class:
+            constants = compiled_class.read()
+        # Name and descriptor of main(String[]) are in the constant pool of a class declaring it
+        if b'\x00\x04main' in constants and b'([Ljava/lang/String;)V' in constants:
+            candidates.append(class_name)
+    if name in candidates:
+        return name
+    return candidates[0] if candidates else 'Player'
+
+
+DEFAULT_LAUNCHERS = [
+    Launcher(('.py',), ('python', '{source}')),
+    Launcher(('.js',), ('node', '{source}')),
+    Launcher(('.java',), (java_command('java'), '-cp', '{artifact}', '{main}'),
+             (java_command('javac'), '-d', '{artifact}', '{source}'), (java_command('javac'), '-version'), artifact='',
+             main=java_main_class),
+    Launcher(('.c',), ('{artifact}',), ('gcc', '-O2', '-o', '{artifact}', '{source}', '-lm'), ('gcc', '--version')),
+    Launcher(('.cpp', '.cc', '.cxx'), ('{artifact}',), ('g++', '-O2', '-std=c++17', '-o', '{artifact}', '{source}'),
+             ('g++', '--version')),
+    Launcher(('.rs',), ('{artifact}',), ('rustc', '-O', '-o', '{artifact}', '{source}'), ('rustc', '--version')),
+    Launcher(('.go',), ('{artifact}',), ('go', 'build', '-o', '{artifact}', '{source}'), ('go', 'version')),
+]
+
+
+@lru_cache(maxsize=None)
+def compiler_version(command: tuple[str, ...]) -> str:
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=COMPILE_TIMEOUT)
+    except OSError as e:
+        raise CompilationError(f"Compiler not found: {command[0]}") from e
+    return (result.stdout + result.stderr).decode('utf-8', errors='replace')
+
+
+class LauncherRegistry:
+    """
+    Command line of every bot, by file extension; files with an unknown extension are run as executables.
+    Compiled languages are compiled once: the artifact is cached in `cache_directory` under a hash of the source, the
+    compile command and the compiler version, and reused by every game, and every later run, until one of them changes.
+    """
+
+    def __init__(self, launchers: list[Launcher] | None = None, cache_directory: str = CACHE_DIRECTORY):
+        self._launchers: dict[str, Launcher] = {}
+        self._cache_directory = cache_directory
+        # Commands already resolved by this process, by (path, mtime, size) of the source
+        self._commands: dict[tuple[str, int, int], list[str]] = {}
+        self._lock = threading.Lock()
+        for launcher in DEFAULT_LAUNCHERS if launchers is None else launchers:
+            self.register(launcher)
+
+    def register(self, launcher: Launcher):
+        for extension in launcher.extensions:
+            self._launchers[extension] = launcher
+
+    def launcher_for(self, path: str) -> Launcher | None:
+        return self._launchers.get(os.path.splitext(path)[1].lower())
+
+    def command(self, path: str) -> list[str]:
+        """ Command line running the bot at `path`, compiling it first if it is not in the cache """
+        launcher = self.launcher_for(path)
+        if launcher is None:
+            return [path]
+        if launcher.compile is None:
+            return self._format(launcher.run, path, '')
+
+        status = os.stat(path)
+        key = (os.path.abspath(path), status.st_mtime_ns, status.st_size)
+        command = self._commands.get(key)
+        if command is None:
+            artifact = self._compile(launcher, path)
+            main = launcher.main(artifact, self._name(path)) if launcher.main else None
+            command = self._format(launcher.run, path, artifact, main)
+            with self._lock:
+                self._commands[key] = command
+        return command
+
+    def prepare(self, paths: list[str], max_workers: int | None = None) -> dict[str, list[str]]:
+        """ Compiles every distinct bot of `paths` in parallel, to be called before a batch of games """
+        distinct_paths = list(dict.fromkeys(paths))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            commands = executor.map(self.command, distinct_paths)
+            return dict(zip(distinct_paths, commands))
+
+    def _compile(self, launcher: Launcher, path: str) -> str:
+        with open(path, 'rb') as source_file:
+            digest = hashlib.sha256(source_file.read())
+        digest.update("\0".join(launcher.compile).encode('utf-8'))
+        digest.update(compiler_version(launcher.version).encode('utf-8') if launcher.version else b"")
+        directory = os.path.join(self._cache_directory, digest.hexdigest())
+        artifact = os.path.join(directory, launcher.artifact) if launcher.artifact else directory
+        if os.path.isdir(directory):
+            return artifact
+
+        # Compiled aside then renamed, so that a concurrent run never sees a partial artifact
+        os.makedirs(self._cache_directory, exist_ok=True)
+        build_directory = tempfile.mkdtemp(prefix='build_', dir=self._cache_directory)
+        build_artifact = os.path.join(build_directory, launcher.artifact) if launcher.artifact else build_directory
+        try:
+            result = subprocess.run(self._format(launcher.compile, path, build_artifact), capture_output=True,
+                                    timeout=COMPILE_TIMEOUT)
+            if result.returncode != 0:
+                raise CompilationError(f"Cannot compile {path}:\n{result.stderr.decode('utf-8', errors='replace')}")
+            os.rename(build_directory, directory)
+        except subprocess.TimeoutExpired as e:
+            raise CompilationError(f"Cannot compile {path}: no result within {COMPILE_TIMEOUT} s") from e
+        except OSError as e:
+            if not os.path.isdir(directory):
+                raise CompilationError(f"Cannot compile {path}: {e}") from e
+        finally:
+            shutil.rmtree(build_directory, ignore_errors=True)
+        return artifact
+
+    @staticmethod
+    def _name(path: str) -> str:
+        return os.path.splitext(os.path.basename(path))[0]
+
+    @staticmethod
+    def _format(template: tuple[str, ...], path: str, artifact: str, main: str | None = None) -> list[str]:
+        name = LauncherRegistry._name(path)
+        return [argument.format(source=path, artifact=artifact, name=name, main=main or name) for argument in template]
+
+
+_registry: LauncherRegistry | None = None
+
+
+def get_registry() -> LauncherRegistry:
+    """ Registry used by the AIs, shared by the whole process """
+    global _registry
+    if _registry is None:
+        _registry = LauncherRegistry()
+    return _registry
@@ -0,0 +1,98 @@
+import mmap
+from array import array
+import tempfile
+import zlib
+
+
+def decode_logs(stderr: bytes | bytearray) -> list[str]:
+    """ Logs of a turn as returned by get_logs_at_turn: its stderr lines followed by a '\n' separator """
+    return [line.rstrip() for line in stderr.decode('utf-8', errors='replace').splitlines()] + ['\n']
+
+
+class LogStore:
+    """
+    Raw stderr of every turn of an AI, in a single buffer delimited by turn offsets.
+    Turns are kept in memory until they weigh more than `memory_budget` bytes: from then on, every turn is appended
+    to a temporary file, compressed with zlib if `compress` is set, and only its offsets are kept in memory. Spilled
+    turns are read back through a mmap of the file when asked for.
+    Turns are stored as received and decoded on demand.
+    """
+
+    def __init__(self, memory_budget: int | None = None, compress: bool = False, directory: str | None = None):
+        self._memory_budget = memory_budget
+        self._compress = compress
+        self._directory = directory
+        self._data = bytearray()
+        # Turn t spans [offsets[t], offsets[t+1]) of the buffer, or of the file once spilled
+        self._offsets = array('Q', [0])
+        self._file = None
+        self._mmap: mmap.mmap | None = None
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def append(self, stderr: bytes | bytearray):
+        if self._file is None:
+            self._data += stderr
+            self._offsets.append(len(self._data))
+            if self._memory_budget is not None and len(self._data) > self._memory_budget:
+                self._spill()
+            return
+        self._write(stderr)
+
+    def get(self, turn: int) -> bytes | None:
+        if not 0 <= turn < len(self):
+            return None
+        (start, end) = (self._offsets[turn], self._offsets[turn + 1])
+        if self._file is None:
+            with memoryview(self._data) as data:
+                return bytes(data[start:end])
+        if start == end:
+            return b""
+        if self._mmap is None or len(self._mmap) < end:
+            self._remap()
+        data = self._mmap[start:end]
+        return zlib.decompress(data) if self._compress else data
+
+    def get_logs(self, turn: int) -> list[str] | None:
+        stderr = self.get(turn)
+        return None if stderr is None else decode_logs(stderr)
+
+    def memory_size(self) -> int:
+        """ Bytes of logs held in memory """
+        return len(self._data)
+
+    def close(self):
+        """ Releases the buffer and the temporary file: no turn is left in the store """
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _spill(self):
+        self._file = tempfile.TemporaryFile(prefix='logs_', dir=self._directory)
+        (data, offsets) = (self._data, self._offsets)
+        self._data = bytearray()
+        self._offsets = array('Q', [0])
+        if not self._compress:
+            self._file.write(data)
+            self._offsets = offsets
+            return
+        with memoryview(data) as view:
+            for turn in range(len(offsets) - 1):
+                self._write(view[offsets[turn]:offsets[turn + 1]])
+
+    def _write(self, stderr: bytes | bytearray | memoryview):
+        data = zlib.compress(stderr, 1) if self._compress else stderr
+        self._file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+
+    def _remap(self):
+        self._file.flush()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._mmap = mmap.mmap(self._file.fileno(), self._offsets[-1], access=mmap.ACCESS_READ)
@@ -0,0 +1,111 @@
+import threading
+from subprocess import Popen
+
+from simulator_module.ai.io_loop import IOLoop, Pipe
+from simulator_module.ai.zygote import ZygoteProcess
+from simulator_module.util.logger import Logger
+
+# Sent on stdin instead of a turn input once a game is over: the bot must forget that game and answer RESET_ACK
+RESET_REQUEST = b"#RESET\n"
+RESET_ACK = "#READY"
+RESET_TIMEOUT = 1.0
+
+
+class BotPool:
+    """
+    Running bots of reusable AIs (see AiConfig.reusable), kept between games instead of being killed and started again.
+    A bot is leased by the AI of a game, and released when the AI stops: it is then asked to reset and goes back to
+    the pool only if it acknowledges the reset and has not written anything else. A bot that died or wrote something
+    while idle is never leased again.
+    A pool can be shared by simulations run one after another or concurrently, it must be closed by its owner.
+    """
+
+    def __init__(self, logger: Logger, reset_timeout: float = RESET_TIMEOUT):
+        self._logger = logger
+        self._reset_timeout = reset_timeout
+        self._idle: dict[str, list[Popen | ZygoteProcess]] = {}
+        self._io_loop = IOLoop()
+        self._lock = threading.Lock()
+
+    def lease(self, path: str) -> Popen | ZygoteProcess | None:
+        """ An idle bot running `path`, None when there is none and a new one has to be started """
+        with self._lock:
+            idle = self._idle.get(path, [])
+            while idle:
+                process = idle.pop()
+                if self._is_clean(process):
+                    return process
+                self._logger.log(f"Pooled bot {process.pid} ({path}) died or wrote while idle, it is discarded")
+                self._kill(process)
+            return None
+
+    def release(self, path: str, process: Popen | ZygoteProcess):
+        """ Resets the bot and puts it back in the pool, or kills it if it does not reset properly """
+        with self._lock:
+            try:
+                self._reset(process)
+            except Exception as e:
+                self._logger.log(f"Pooled bot {process.pid} ({path}) did not reset, it is killed: {e}")
+                self._kill(process)
+                return
+            self._idle.setdefault(path, []).append(process)
+
+    def __len__(self):
+        return sum(len(idle) for idle in self._idle.values())
+
+    def close(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for process in idle:
+                    self._kill(process)
+            self._idle.clear()
+            self._io_loop.close()
+
+    def _reset(self, process: Popen | ZygoteProcess):
+        if process.poll() is not None:
+            raise EOFError("Process is not running")
+        (stdout, stderr) = self._register(process)
+        try:
+            process.stdin.write(RESET_REQUEST)
+            process.stdin.flush()
+            line = self._io_loop.read_line(stdout, self._reset_timeout)
+            if line != RESET_ACK:
+                raise ValueError(f"Expected {RESET_ACK}, got {line!r}")
+            leftover = self._io_loop.drain(stdout)
+            if leftover:
+                raise ValueError(f"Unexpected output after {RESET_ACK}: {leftover[:80]!r}")
+        finally:
+            # stderr written while resetting must not end up in the logs of the next game
+            self._io_loop.drain(stderr)
+            self._unregister(stdout, stderr)
+
+    def _is_clean(self, process: Popen | ZygoteProcess) -> bool:
+        if process.poll() is not None:
+            return False
+        (stdout, stderr) = self._register(process)
+        try:
+            self._io_loop.drain(stderr)
+            return not self._io_loop.drain(stdout) and not stdout.closed
+        finally:
+            self._unregister(stdout, stderr)
+
+    def _register(self, process: Popen | ZygoteProcess) -> tuple[Pipe, Pipe]:
+        stdout = Pipe(f"stdout of pooled bot {process.pid}", process.stdout)
+        stderr = Pipe(f"stderr of pooled bot {process.pid}", process.stderr)
+        self._io_loop.register(stdout)
+        self._io_loop.register(stderr)
+        return stdout, stderr
+
+    def _unregister(self, *pipes: Pipe):
+        for pipe in pipes:
+            self._io_loop.unregister(pipe)
+
+    @staticmethod
+    def _kill(process: Popen | ZygoteProcess):
+        process.kill()
+        process.wait()
+        for stream in (process.stdin, process.stdout, process.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
@@ -0,0 +1,101 @@
+import os
+import signal
+from unittest import skipUnless, mock
+
+from simulator_module.ai.ai import encode_players_info
+from simulator_module.ai.testing import BotTestCase, UP_BOT, SLOW_BOT, EXITING_BOT, BUSY_BOT
+from simulator_module.ai.zygote import Zygote, zygote_available
+from simulator_module.game.player_turn import Move
+
+
+class Test(BotTestCase):
+
+    def test_ask_reads_move(self):
+        ai = self.create_ai(UP_BOT)
+        player_turn = ai.ask(2, [(0, 0, 0, 0), (5, 5, 5, 5)])
+        self.assertEqual(player_turn.move, Move.UP)
+        self.assertFalse(player_turn.timed_out)
+        self.assertEqual(player_turn.turn, 0)
+
+    def test_slow_bot_is_eliminated(self):
+        ai = self.create_ai(SLOW_BOT, turn_timeout=0.1)
+        self.assertEqual(ai.ask(1, [(0, 0, 0, 0)]).move, Move.UP)
+        player_turn = ai.ask(1, [(0, 0, 0, 0)])
+        self.assertEqual(player_turn.move, Move.DEATH)
+        self.assertTrue(player_turn.timed_out)
+        self.assertLess(player_turn.duration, 0.4)
+
+    def test_exited_bot_is_eliminated(self):
+        for wait in (False, True):
+            ai = self.create_ai(EXITING_BOT)
+            if wait:
+                # Its stdin is closed before the turn input is written
+                ai._process.wait(timeout=5)
+            player_turn = ai.ask(1, [(0, 0, 0, 0)])
+            self.assertEqual(player_turn.move, Move.DEATH)
+            self.assertFalse(player_turn.timed_out)
+            self.assertFalse(ai._running)
+
+    def test_players_info_is_encoded_once(self):
+        players_infos = ((0, 0, 1, 0), (5, 5, 5, 6))
+        encoded = encode_players_info(players_infos)
+        self.assertEqual(encoded, b"0 0 1 0\n5 5 5 6\n")
+        self.assertIs(encode_players_info(tuple(list(players_infos))), encoded)
+
+    def test_turn_timings_are_split(self):
+        ai = self.create_ai(UP_BOT, ipc_baseline_ns=1000)
+        player_turn = ai.ask(1, [(0, 0, 0, 0)])
+        self.assertGreater(player_turn.write_ns, 0)
+        self.assertEqual(player_turn.wait_ns + player_turn.read_ns, round(player_turn.duration * 1e9))
+        self.assertAlmostEqual(player_turn.decision_duration, player_turn.duration - 1e-6, places=9)
+
+    def test_stderr_is_attributed_to_its_turn(self):
+        ai = self.create_ai(UP_BOT)
+        for _ in range(3):
+            ai.ask(1, [(0, 0, 0, 0)])
+        for turn in range(3):
+            self.assertEqual(ai.get_logs_at_turn(turn), ["thinking", "\n"])
+
+    @skipUnless(zygote_available(), "fork and fd passing are not available")
+    def test_zygote_spawned_bot(self):
+        zygote = Zygote()
+        self.addCleanup(zygote.close)
+        ai = self.create_ai(UP_BOT, zygote=zygote)
+        for _ in range(2):
+            self.assertEqual(ai.ask(1, [(0, 0, 0, 0)]).move, Move.UP)
+        self.assertEqual(ai.get_logs_at_turn(1), ["thinking", "\n"])
+        ai.stop()
+        self.assertIsNotNone(ai._process.wait(timeout=1))
+
+    @skipUnless(zygote_available(), "fork and fd passing are not available")
+    def test_zygote_bot_is_not_killed_once_exited(self):
+        zygote = Zygote()
+        self.addCleanup(zygote.close)
+        exited = zygote.spawn(self.write_bot(UP_BOT))
+        exited.stdin.close()
+        exited.wait(timeout=1)
+        running = zygote.spawn(self.write_bot(SLOW_BOT))
+        with mock.patch('os.kill') as kill:
+            # Its pid may have been given to another process
+            exited.kill()
+            running.kill()
+            self.assertIsNotNone(running.wait(timeout=1))
+        if hasattr(signal, 'pidfd_send_signal'):
+            kill.assert_not_called()
+        for process in (exited, running):
+            for stream in (process.stdin, process.stdout, process.stderr):
+                stream.close()
+
+    @skipUnless(os.path.exists('/proc/self/stat') and hasattr(os, 'sched_getaffinity'), "needs procfs and affinity")
+    def test_cpu_time_and_affinity(self):
+        # A loaded host slows the bot down, it must not time out
+        ai = self.create_ai(BUSY_BOT, cpus=[0], first_turn_timeout=10, turn_timeout=10)
+        self.assertEqual(os.sched_getaffinity(ai._process.pid), {0})
+        player_turns = [ai.ask(1, [(0, 0, 0, 0)]) for _ in range(3)]
+        for player_turn in player_turns:
+            self.assertFalse(player_turn.timed_out)
+            self.assertEqual(player_turn.move, Move.UP)
+        # Measured in clock ticks: 50 ms of work reads as 40 to 60 ms with 10 ms ticks, a tick more is allowed
+        self.assertGreaterEqual(sum(player_turn.cpu_ns for player_turn in player_turns), 90_000_000)
+        for player_turn in player_turns:
+            self.assertLessEqual(player_turn.cpu_ns, player_turn.duration * 1e9 + 50_000_000)
@@ -0,0 +1,35 @@
+import json
+import os
+
+from simulator_module.ai.calibration import get_calibration, host_key, HostCalibration
+from simulator_module.ai.testing import BotTestCase, SLOW_BOT
+from simulator_module.game.player_turn import PlayerTurn, Move
+from simulator_module.util.logger import Logger
+
+
+class Test(BotTestCase):
+
+    def test_calibration_is_cached_per_host(self):
+        calibration_file = os.path.join(self._directory.name, 'calibration.json')
+        calibration = get_calibration(Logger(), calibration_file)
+        self.assertGreater(calibration.host_median_us, 0)
+        with open(calibration_file) as cache_file:
+            self.assertEqual(json.load(cache_file), {host_key(): calibration.host_median_us})
+
+        other_file = os.path.join(self._directory.name, 'other.json')
+        with open(other_file, 'w') as cache_file:
+            json.dump({host_key(): 500}, cache_file)
+        self.assertEqual(get_calibration(Logger(), other_file).factor, 2)
+
+    def test_codingame_equivalent_time(self):
+        factor = HostCalibration(500).factor
+        player_turn = PlayerTurn(0, 1, Move.UP, 0.08, ipc_baseline_ns=10_000_000, host_factor=factor)
+        self.assertAlmostEqual(player_turn.codingame_ms, 35)
+
+    def test_time_limits_are_scaled(self):
+        # SLOW_BOT answers in 500 ms, within the 100 ms limit on a host 6 times slower than CodinGame
+        ai = self.create_ai(SLOW_BOT, host_factor=6)
+        ai.ask(1, [(0, 0, 0, 0)])
+        player_turn = ai.ask(1, [(0, 0, 0, 0)])
+        self.assertEqual(player_turn.move, Move.UP)
+        self.assertLess(player_turn.codingame_ms, 100)
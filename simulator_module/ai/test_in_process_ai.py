@@ -0,0 +1,30 @@
+from simulator_module.ai.in_process_ai import InProcessAI
+from simulator_module.ai.testing import BotTestCase, UP_BOT, SLOW_BOT
+from simulator_module.game.player_turn import Move
+
+
+class Test(BotTestCase):
+
+    def test_ask_reads_move_and_logs(self):
+        ai = self.create_ai(UP_BOT, InProcessAI)
+        for turn in range(3):
+            player_turn = ai.ask(2, [(0, 0, 0, 0), (5, 5, 5, 5)])
+            self.assertEqual(player_turn.move, Move.UP)
+            self.assertEqual(player_turn.turn, turn)
+            self.assertEqual(player_turn.wait_ns + player_turn.read_ns, round(player_turn.duration * 1e9))
+        self.assertEqual(ai.get_logs_at_turn(2), ["thinking", "\n"])
+
+    def test_slow_bot_is_eliminated(self):
+        ai = self.create_ai(SLOW_BOT, InProcessAI, turn_timeout=0.1)
+        self.assertEqual(ai.ask(1, [(0, 0, 0, 0)]).move, Move.UP)
+        player_turn = ai.ask(1, [(0, 0, 0, 0)])
+        self.assertEqual(player_turn.move, Move.DEATH)
+        self.assertTrue(player_turn.timed_out)
+        self.assertLess(player_turn.duration, 0.4)
+
+    def test_crashing_bot_logs_its_traceback(self):
+        ai = self.create_ai("raise ValueError('broken bot')\n", InProcessAI)
+        player_turn = ai.ask(1, [(0, 0, 0, 0)])
+        self.assertEqual(player_turn.move, Move.DEATH)
+        self.assertFalse(player_turn.timed_out)
+        self.assertIn("ValueError: broken bot", ai.get_logs_at_turn(0))
@@ -0,0 +1,107 @@
+import os
+import shutil
+from unittest import skipUnless, mock
+
+from simulator_module.ai.ai import AI
+from simulator_module.ai.launchers import LauncherRegistry, CompilationError, java_main_class
+from simulator_module.ai.testing import BotTestCase
+from simulator_module.game.player_turn import Move
+from simulator_module.util.logger import Logger
+
+C_BOT = """
+#include <stdio.h>
+int main() {
+    int n, my_id, x0, y0, x1, y1;
+    while (scanf("%d %d", &n, &my_id) == 2) {
+        for (int i = 0; i < n; i++) scanf("%d %d %d %d", &x0, &y0, &x1, &y1);
+        fprintf(stderr, "compiled\\n");
+        printf("UP\\n");
+        fflush(stdout);
+    }
+    return 0;
+}
+"""
+
+# As on CodinGame, the main class is Player whatever the file is named
+JAVA_BOT = """
+import java.util.Scanner;
+
+class Direction {
+    static final String UP = "UP";
+}
+
+class Player {
+    public static void main(String[] args) {
+        Scanner in = new Scanner(System.in);
+        while (in.hasNextInt()) {
+            int n = in.nextInt();
+            in.nextInt();
+            for (int i = 0; i < 4 * n; i++) in.nextInt();
+            System.out.println(Direction.UP);
+        }
+    }
+}
+"""
+# Constant pool entries of a compiled class declaring main(String[])
+MAIN_CONSTANTS = b"\x01\x00\x04main\x01\x00\x16([Ljava/lang/String;)V"
+
+
+class Test(BotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._cache_directory = os.path.join(self._directory.name, 'cache')
+
+    def test_interpreted_and_unknown_bots(self):
+        registry = LauncherRegistry(cache_directory=self._cache_directory)
+        self.assertEqual(registry.command("bots/bot.py"), ['python', "bots/bot.py"])
+        self.assertEqual(registry.command("bots/bot"), ["bots/bot"])
+
+    @skipUnless(shutil.which('gcc'), "gcc is not installed")
+    def test_c_bot_is_compiled_once(self):
+        path = self.write_bot(C_BOT, "bot.c")
+        command = LauncherRegistry(cache_directory=self._cache_directory).prepare([path, path])[path]
+        self.assertEqual(len(os.listdir(self._cache_directory)), 1)
+
+        # Another registry, as in another run, finds the artifact in the cache
+        registry = LauncherRegistry(cache_directory=self._cache_directory)
+        self.assertEqual(registry.command(path), command)
+        with mock.patch('simulator_module.ai.ai.get_registry', return_value=registry):
+            ai = AI(0, path, (0, 0), None, Logger())
+        try:
+            self.assertEqual(ai.ask(1, [(0, 0, 0, 0)]).move, Move.UP)
+            self.assertEqual(ai.get_logs_at_turn(0), ["compiled", "\n"])
+        finally:
+            ai.stop()
+
+    @skipUnless(shutil.which('gcc'), "gcc is not installed")
+    def test_compilation_error(self):
+        path = self.write_bot("int main() { return }", "broken.c")
+        with self.assertRaises(CompilationError):
+            LauncherRegistry(cache_directory=self._cache_directory).command(path)
+        self.assertEqual(os.listdir(self._cache_directory), [])
+
+    def test_java_main_class(self):
+        classes = os.path.join(self._directory.name, 'classes')
+        os.mkdir(classes)
+        for (class_name, constants) in [("Direction", b""), ("Main", MAIN_CONSTANTS), ("Main$Inner", MAIN_CONSTANTS),
+                                        ("bot", b"")]:
+            with open(os.path.join(classes, f"{class_name}.class"), 'wb') as class_file:
+                class_file.write(b"\xca\xfe\xba\xbe" + constants)
+        self.assertEqual(java_main_class(classes, "bot"), "Main")
+        with open(os.path.join(classes, "bot.class"), 'wb') as class_file:
+            class_file.write(b"\xca\xfe\xba\xbe" + MAIN_CONSTANTS)
+        self.assertEqual(java_main_class(classes, "bot"), "bot")
+        self.assertEqual(java_main_class(self._directory.name, "bot"), "Player")
+
+    @skipUnless(shutil.which('javac'), "javac is not installed")
+    def test_java_bot_runs_its_main_class(self):
+        path = self.write_bot(JAVA_BOT, "mybot.java")
+        registry = LauncherRegistry(cache_directory=self._cache_directory)
+        self.assertEqual(registry.command(path)[-1], "Player")
+        with mock.patch('simulator_module.ai.ai.get_registry', return_value=registry):
+            ai = AI(0, path, (0, 0), None, Logger())
+        try:
+            self.assertEqual(ai.ask(1, [(0, 0, 0, 0)]).move, Move.UP)
+        finally:
+            ai.stop()
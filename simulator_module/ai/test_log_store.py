@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from simulator_module.ai.log_store import LogStore
+
+PAINT_TURN = b"".join(f"#PAINT {i} 0 #ff0000\n".encode('utf-8') for i in range(200))
+
+
+class Test(TestCase):
+
+    def check_turns(self, store: LogStore, turns: list[bytes]):
+        self.assertEqual(len(store), len(turns))
+        for (turn, stderr) in enumerate(turns):
+            self.assertEqual(store.get(turn), stderr)
+        self.assertIsNone(store.get(len(turns)))
+
+    def test_turns_stay_in_memory_within_budget(self):
+        store = LogStore()
+        turns = [PAINT_TURN, b"", b"thinking\n"]
+        for stderr in turns:
+            store.append(stderr)
+        self.check_turns(store, turns)
+        self.assertEqual(store.get_logs(2), ["thinking", "\n"])
+        self.assertEqual(store.get_logs(1), ["\n"])
+
+    def test_turns_are_spilled_beyond_budget(self):
+        for compress in (False, True):
+            store = LogStore(memory_budget=len(PAINT_TURN) * 2, compress=compress)
+            turns = []
+            for turn in range(10):
+                turns.append(PAINT_TURN if turn % 3 else b"")
+                store.append(turns[-1])
+                # Reading while appending remaps the file as it grows
+                self.assertEqual(store.get(turn), turns[-1])
+            self.assertEqual(store.memory_size(), 0)
+            self.check_turns(store, turns)
+            store.close()
+
+    def test_closed_store_has_no_turns(self):
+        store = LogStore(memory_budget=0, compress=True)
+        store.append(PAINT_TURN)
+        store.close()
+        self.assertEqual(len(store), 0)
+        self.assertIsNone(store.get(0))
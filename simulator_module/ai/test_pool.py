@@ -0,0 +1,45 @@
+from simulator_module.ai.ai import AI
+from simulator_module.ai.pool import BotPool
+from simulator_module.ai.testing import BotTestCase, UP_BOT, RESETTABLE_BOT
+from simulator_module.game.player_turn import Move
+from simulator_module.util.logger import Logger
+
+
+class Test(BotTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._pool = BotPool(Logger(), reset_timeout=0.5)
+
+    def tearDown(self):
+        self._pool.close()
+        super().tearDown()
+
+    def play_game(self, path) -> tuple[AI, list[str]]:
+        ai = AI(0, path, (0, 0), None, Logger(), pool=self._pool)
+        self.assertEqual(ai.ask(1, [(0, 0, 0, 0)]).move, Move.UP)
+        logs = ai.get_logs_at_turn(0)
+        ai.stop()
+        return ai, logs
+
+    def test_bot_is_reused_after_reset(self):
+        path = self.write_bot(RESETTABLE_BOT)
+        (first_ai, first_logs) = self.play_game(path)
+        self.assertEqual(len(self._pool), 1)
+        (second_ai, second_logs) = self.play_game(path)
+
+        self.assertEqual(second_ai._process.pid, first_ai._process.pid)
+        self.assertEqual(first_logs, ["game 0", "\n"])
+        self.assertEqual(second_logs, ["game 1", "\n"])
+
+    def test_bot_without_reset_is_killed(self):
+        (ai, _) = self.play_game(self.write_bot(UP_BOT))
+        self.assertEqual(len(self._pool), 0)
+        self.assertIsNotNone(ai._process.poll())
+
+    def test_dead_bot_is_not_leased(self):
+        path = self.write_bot(RESETTABLE_BOT)
+        (ai, _) = self.play_game(path)
+        ai._process.kill()
+        ai._process.wait()
+        self.assertIsNone(self._pool.lease(path))
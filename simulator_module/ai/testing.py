@@ -0,0 +1,91 @@
+"""
+Bots and fixture shared by the tests of the AI drivers.
+"""
+import os
+import tempfile
+from unittest import TestCase
+
+from simulator_module.ai.ai import AI, BaseAI
+from simulator_module.util.logger import Logger
+
+UP_BOT = """
+import sys
+while True:
+    n, my_id = map(int, input().split())
+    for j in range(n):
+        input()
+    print("thinking", file=sys.stderr)
+    print("UP")
+"""
+
+SLOW_BOT = """
+import time
+turn = 0
+while True:
+    n, my_id = map(int, input().split())
+    for j in range(n):
+        input()
+    time.sleep(0.5 if turn > 0 else 0)
+    print("UP", flush=True)
+    turn += 1
+"""
+
+EXITING_BOT = """
+import sys
+sys.exit(0)
+"""
+
+BUSY_BOT = """
+import time
+while True:
+    n, my_id = map(int, input().split())
+    for j in range(n):
+        input()
+    end = time.process_time() + 0.05
+    while time.process_time() < end:
+        pass
+    print("UP", flush=True)
+"""
+
+# Implements the reset protocol of BotPool
+RESETTABLE_BOT = """
+import sys
+game = 0
+while True:
+    line = input()
+    if line == "#RESET":
+        game += 1
+        print("#READY", flush=True)
+        continue
+    n, my_id = map(int, line.split())
+    for j in range(n):
+        input()
+    print(f"game {game}", file=sys.stderr)
+    print("UP", flush=True)
+"""
+
+
+class BotTestCase(TestCase):
+    """ Writes bots to a temporary directory, and stops the AIs created from them after each test """
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._ais = []
+
+    def tearDown(self):
+        for ai in self._ais:
+            ai.stop()
+        self._directory.cleanup()
+
+    def write_bot(self, source: str, name: str | None = None) -> str:
+        if name is None:
+            name = f"bot_{len(os.listdir(self._directory.name))}.py"
+        path = os.path.join(self._directory.name, name)
+        with open(path, 'w') as bot_file:
+            bot_file.write(source)
+        return path
+
+    def create_ai(self, source: str, ai_class: type[BaseAI] = AI, **kwargs):
+        ai = ai_class(0, self.write_bot(source), (0, 0), None, Logger(), **kwargs)
+        self._ais.append(ai)
+        return ai
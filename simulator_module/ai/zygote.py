@@ -0,0 +1,140 @@
+import atexit
+import json
+import os
+import select
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+ZYGOTE_SERVER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'zygote_server.py')
+# Modules commonly imported by bots, loaded once in the zygote and inherited by every forked bot
+PRELOADED_MODULES = ['collections', 'heapq', 'itertools', 'math', 'random', 're', 'statistics', 'time']
+
+
+def zygote_available() -> bool:
+    return hasattr(os, 'fork') and hasattr(socket, 'send_fds')
+
+
+class ZygoteProcess:
+    """
+    Bot forked by the zygote, with the subset of the Popen API used by AI.
+    The process is a child of the zygote, which reaps it: wait() only waits for it to disappear, through a pidfd
+    where available.
+    """
+
+    def __init__(self, pid: int, stdin: int, stdout: int, stderr: int):
+        self.pid = pid
+        self.stdin = open(stdin, 'wb', buffering=0)
+        self.stdout = open(stdout, 'rb', buffering=0)
+        self.stderr = open(stderr, 'rb', buffering=0)
+        self.returncode = None
+        try:
+            self._pidfd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            self._pidfd = None
+
+    def poll(self) -> int | None:
+        if self.returncode is not None:
+            return self.returncode
+        if self._pidfd is not None:
+            exited = bool(select.select([self._pidfd], [], [], 0)[0])
+        else:
+            try:
+                os.kill(self.pid, 0)
+                exited = False
+            except ProcessLookupError:
+                exited = True
+        if exited:
+            self.returncode = -signal.SIGKILL
+            if self._pidfd is not None:
+                os.close(self._pidfd)
+                self._pidfd = None
+        return self.returncode
+
+    def kill(self):
+        # The zygote reaps its bots as soon as they exit: the pid of a bot that exited may be another process's now
+        if self.poll() is not None:
+            return
+        try:
+            if self._pidfd is not None:
+                signal.pidfd_send_signal(self._pidfd, signal.SIGKILL)
+            else:
+                os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def wait(self, timeout: float | None = None) -> int:
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while self.poll() is None:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            if self._pidfd is not None:
+                select.select([self._pidfd], [], [], remaining)
+            else:
+                time.sleep(0.001)
+        return self.returncode
+
+
+class Zygote:
+    """
+    Warm Python interpreter with common modules preloaded, forked for every Python bot instead of starting a new
+    interpreter. POSIX only, see zygote_available().
+    """
+
+    def __init__(self, preloaded_modules: list[str] | None = None):
+        modules = PRELOADED_MODULES if preloaded_modules is None else preloaded_modules
+        (self._socket, zygote_socket) = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._process = subprocess.Popen([sys.executable, ZYGOTE_SERVER, str(zygote_socket.fileno()), *modules],
+                                         pass_fds=[zygote_socket.fileno()], stdin=subprocess.DEVNULL)
+        zygote_socket.close()
+        self._replies = self._socket.makefile('rb')
+        self._lock = threading.Lock()
+
+    def spawn(self, path: str) -> ZygoteProcess:
+        (stdin_read, stdin_write) = os.pipe()
+        (stdout_read, stdout_write) = os.pipe()
+        (stderr_read, stderr_write) = os.pipe()
+        child_fds = [stdin_read, stdout_write, stderr_write]
+        try:
+            with self._lock:
+                socket.send_fds(self._socket, [json.dumps({'path': os.path.abspath(path)}).encode('utf-8')], child_fds)
+                reply = self._replies.readline()
+        except OSError:
+            for fd in (stdin_write, stdout_read, stderr_read):
+                os.close(fd)
+            raise
+        finally:
+            for fd in child_fds:
+                os.close(fd)
+        if not reply:
+            for fd in (stdin_write, stdout_read, stderr_read):
+                os.close(fd)
+            raise Exception("Zygote stopped")
+        return ZygoteProcess(int(reply), stdin_write, stdout_read, stderr_read)
+
+    def close(self):
+        self._replies.close()
+        self._socket.close()
+        try:
+            self._process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+            self._process.wait()
+
+
+_zygote: Zygote | None = None
+_zygote_lock = threading.Lock()
+
+
+def get_zygote() -> Zygote:
+    """ Zygote shared by every simulation of the process, started on first use """
+    global _zygote
+    with _zygote_lock:
+        if _zygote is None:
+            _zygote = Zygote()
+            atexit.register(_zygote.close)
+        return _zygote
@@ -0,0 +1,75 @@
+"""
+Zygote interpreter, started by simulator_module.ai.zygote.Zygote: python zygote_server.py <socket fd> [module ...]
+Preloads the given modules, then for every request received on the socket forks a child running the requested bot
+script with the three received file descriptors as its stdin, stdout and stderr, and answers with the child's pid.
+This file is run as a script: it must not import anything from the simulator.
+"""
+import importlib
+import json
+import os
+import runpy
+import signal
+import socket
+import sys
+import traceback
+
+
+def run_bot(path: str, fds: list[int]):
+    for (target, fd) in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', closefd=False)
+    sys.stderr = open(2, 'w', buffering=1, closefd=False)
+    sys.argv = [path]
+    sys.path[0] = os.path.dirname(os.path.abspath(path))
+    exit_code = 0
+    try:
+        runpy.run_path(path, run_name='__main__')
+    except SystemExit as e:
+        exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except OSError:
+                pass
+    os._exit(exit_code)
+
+
+def serve(sock: socket.socket):
+    while True:
+        try:
+            (message, fds, _, _) = socket.recv_fds(sock, 65536, 3)
+        except OSError:
+            return
+        if not message:
+            return
+        request = json.loads(message)
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            run_bot(request['path'], fds)
+        for fd in fds:
+            os.close(fd)
+        sock.sendall(f"{pid}\n".encode('utf-8'))
+
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    for module in sys.argv[2:]:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+    # Children are reaped automatically, the simulator only watches their pipes
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    serve(sock)
+
+
+if __name__ == "__main__":
+    main()
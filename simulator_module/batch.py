@@ -0,0 +1,146 @@
+"""
+Headless batch runner: python -m simulator_module.batch config.json --games 1000 --workers 8
+Plays the games of the config in parallel worker processes and writes one JSON line per finished game.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.queues import Queue
+
+from simulator_module.ai.calibration import get_calibration
+from simulator_module.ai.launchers import get_registry
+from simulator_module.ai.pool import BotPool
+from simulator_module.config import Config
+from simulator_module.game.game import Game
+from simulator_module.simulator import Simulation
+from simulator_module.util.logger import QuietLogger, Logger
+
+# Bots of reusable AIs kept by a worker process between its games
+_worker_pool: BotPool | None = None
+
+
+def _init_worker(cpus: Queue | None):
+    global _worker_pool
+    if cpus is not None:
+        # Bots inherit the affinity of the worker that starts them: the games of a worker share its core only
+        os.sched_setaffinity(0, {cpus.get()})
+    # Pooled bots exit on their own when the worker dies, as their stdin is closed
+    _worker_pool = BotPool(QuietLogger())
+
+
+def player_stats(game: Game, player: int, program_path: str) -> dict:
+    player_turns = [game.get_player_turn_at_step(step) for step in range(1, len(game.get_states()))]
+    player_turns = [player_turn for player_turn in player_turns if player_turn.player_id == player]
+    decision_ms = sorted(player_turn.decision_duration * 1000 for player_turn in player_turns)
+    cpu_ms = [player_turn.cpu_ns / 1e6 for player_turn in player_turns if player_turn.cpu_ns is not None]
+    return {
+        "player": player,
+        "program_path": program_path,
+        "death_step": game.get_player_death_state_index(player),
+        "turns": len(player_turns),
+        "timeouts": sum(player_turn.timed_out for player_turn in player_turns),
+        "decision_ms": {
+            "mean": statistics.fmean(decision_ms) if decision_ms else None,
+            "median": statistics.median(decision_ms) if decision_ms else None,
+            "max": decision_ms[-1] if decision_ms else None,
+        },
+        "codingame_ms_max": max((player_turn.codingame_ms for player_turn in player_turns), default=None),
+        "cpu_ms": sum(cpu_ms) if cpu_ms else None,
+    }
+
+
+def play_game(json_config: dict, game_index: int, seed: int | None) -> dict:
+    """ Plays one game in a worker process and returns its JSON result """
+    if seed is not None:
+        # Random initial coordinates are drawn when the config is read
+        random.seed(seed + game_index)
+    start = time.perf_counter()
+    simulation = None
+    try:
+        config = Config(json_config)
+        if config.replay_file:
+            # Games run concurrently: each one is saved to its own replay, game_3.tronreplay for game.tronreplay
+            (root, extension) = os.path.splitext(config.replay_file)
+            config.replay_file = f"{root}_{game_index}{extension}"
+        simulation = Simulation(config, False, QuietLogger(), pool=_worker_pool)
+        simulation.start()
+    except Exception:
+        return {"game": game_index, "error": traceback.format_exc()}
+    finally:
+        # A worker plays many games: their logs, and the files they were spilled to, are not kept
+        if simulation:
+            simulation.close()
+
+    game = simulation.game
+    return {
+        "game": game_index,
+        "winner": game.get_winner(),
+        "steps": len(game.get_states()) - 1,
+        "initial_coords": [list(ai_config.initial_coords) for ai_config in config.ais],
+        "players": [player_stats(game, player, ai_config.program_path)
+                    for (player, ai_config) in enumerate(config.ais)],
+        "duration_s": time.perf_counter() - start,
+    }
+
+
+def run_batch(json_config: dict, games: int, workers: int, output, seed: int | None = None, pin: bool = False):
+    logger = Logger()
+    config = Config(json_config)
+    # Done once before the workers start: they find the compiled bots and the calibration in the cache
+    get_registry().prepare([ai_config.program_path for ai_config in config.ais])
+    if config.calibrate_host:
+        get_calibration(logger)
+
+    cpus = None
+    if pin:
+        if not hasattr(os, 'sched_getaffinity'):
+            raise Exception("CPU pinning is not supported on this platform")
+        available_cpus = sorted(os.sched_getaffinity(0))
+        workers = min(workers, len(available_cpus))
+        cpus = multiprocessing.Queue()
+        for cpu in available_cpus[:workers]:
+            cpus.put(cpu)
+
+    wins = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cpus,)) as executor:
+        futures = [executor.submit(play_game, json_config, game_index, seed) for game_index in range(games)]
+        for future in as_completed(futures):
+            result = future.result()
+            wins[result.get("winner")] = wins.get(result.get("winner"), 0) + 1
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+    logger.log(f"{games} games in {time.perf_counter() - start:.1f} s with {workers} workers, wins: {wins}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m simulator_module.batch", description=__doc__.strip())
+    parser.add_argument("config", help="JSON config file, as for simulator_module.simulator")
+    parser.add_argument("--games", type=int, default=1, help="number of games to play (default: 1)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--output", help="JSON lines file to write, standard output by default")
+    parser.add_argument("--seed", type=int, help="seed of the random initial coordinates, game i using seed + i")
+    parser.add_argument("--pin", action="store_true",
+                        help="pin every worker, and the bots it starts, to its own CPU")
+    args = parser.parse_args()
+
+    with open(args.config, 'r') as config_file:
+        json_config = json.load(config_file)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        run_batch(json_config, args.games, args.workers, output, args.seed, args.pin)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,11 @@ WIDTH = 30
 class AiConfig:
     program_path: str
     initial_coords: tuple[int, int]
+    first_turn_timeout: float | None
+    turn_timeout: float | None
+    reusable: bool
+    in_process: bool
+    cpus: list[int] | None
 
     def __init__(self, config: dict) -> None:
         self.program_path = config['program_path']
@@ -14,6 +19,20 @@ class AiConfig:
             raise Exception(f"Invalid program_path: {config['program_path']} in config: {config}")
         self.initial_coords = config.get('initial_coords',
                                          (int(random.random() * WIDTH), int(random.random() * HEIGHT)))
+        # Time limits in seconds on CodinGame, CodinGame's limits are used when not set
+        self.first_turn_timeout = config.get('first_turn_timeout', None)
+        self.turn_timeout = config.get('turn_timeout', None)
+        # The bot implements the reset protocol (see BotPool): its process can be kept for the next game
+        self.reusable = config.get('reusable', False)
+        # Trusted Python bot run by a thread of the simulator instead of its own process (see InProcessAI)
+        self.in_process = config.get('in_process', False)
+        # CPUs the bot is pinned to, to keep concurrent games from competing for the same cores
+        self.cpus = config.get('cpus', None)
+
+    def timeouts(self) -> dict[str, float]:
+        """ Time limits overridden by this config, as AI keyword arguments """
+        timeouts = {'first_turn_timeout': self.first_turn_timeout, 'turn_timeout': self.turn_timeout}
+        return {name: timeout for (name, timeout) in timeouts.items() if timeout is not None}
 
     def __str__(self):
         return json.dumps(self, default=lambda o: o.__dict__, indent=4)
@@ -21,10 +40,30 @@ class AiConfig:
 class Config:
     ais: list[AiConfig] = []
     nb_players: int
+    keyframe_interval: int | None
+    measure_ipc_baseline: bool
+    use_zygote: bool
+    log_memory_budget: int | None
+    compress_logs: bool
+    calibrate_host: bool
+    replay_file: str | None
 
     def __init__(self, config: dict) -> None:
         self.ais = [AiConfig(ai) for ai in config.get('ais', [])]
         self.nb_players = len(self.ais)
+        # When set, the game only keeps one full state every keyframe_interval steps (see DeltaStateHistory)
+        self.keyframe_interval = config.get('keyframe_interval', None)
+        # Measures the pipes round-trip with a no-op bot, reported in PlayerTurn.ipc_baseline_ns
+        self.measure_ipc_baseline = config.get('measure_ipc_baseline', True)
+        # Forks Python bots from a warm interpreter instead of starting a new one (POSIX only)
+        self.use_zygote = config.get('use_zygote', False)
+        # Bytes of stderr logs kept in memory per AI, the next ones are spilled to a temporary file (see LogStore)
+        self.log_memory_budget = config.get('log_memory_budget', None)
+        self.compress_logs = config.get('compress_logs', False)
+        # Scales the time limits to the speed of this host compared to CodinGame (see HostCalibration)
+        self.calibrate_host = config.get('calibrate_host', False)
+        # Replay the game is saved to as it is played (see ReplayWriter), in the log directory when logs are kept
+        self.replay_file = config.get('replay_file', None)
 
     def __str__(self):
         return json.dumps(self, default=lambda o: o.__dict__, indent=4)
@@ -0,0 +1,118 @@
+from typing import Callable
+
+import numpy as np
+
+from simulator_module.game.game import HEIGHT, WIDTH
+
+MOVE_NAMES = ['UP', 'DOWN', 'LEFT', 'RIGHT', 'DEATH']
+MOVE_CODES = {name: code for (code, name) in enumerate(MOVE_NAMES)}
+_DX = np.array([0, 0, -1, 1, 600], dtype=np.int32)
+_DY = np.array([-1, 1, 0, 0, 600], dtype=np.int32)
+
+
+class BatchGame:
+    """
+    Plays N games in lockstep, stored as stacked numpy arrays:
+     - board[g, x, y]: player occupying the cell of game g, -1 if empty (same layout as Grid.data)
+     - heads[g, p]: (x, y) of player p in game g, (-1, -1) once dead
+     - alive[g, p]: whether player p is still alive in game g
+    Each call to move_player applies GameState.move_player to every running game at once.
+    """
+    board: np.ndarray
+    heads: np.ndarray
+    alive: np.ndarray
+    winners: np.ndarray
+
+    def __init__(self, initial_coords, width: int = WIDTH, height: int = HEIGHT):
+        """ initial_coords: array-like of shape (nb_games, nb_players, 2) """
+        coords = np.asarray(initial_coords, dtype=np.int32)
+        (self.nb_games, self.nb_players, _) = coords.shape
+        self.width = width
+        self.height = height
+
+        self.board = np.full((self.nb_games, width, height), -1, dtype=np.int8)
+        games = np.arange(self.nb_games)
+        for player in range(self.nb_players):
+            self.board[games, coords[:, player, 0], coords[:, player, 1]] = player
+        self.heads = coords.copy()
+        self.alive = np.ones((self.nb_games, self.nb_players), dtype=bool)
+        self.winners = np.full(self.nb_games, -1, dtype=np.int32)
+        self._update_winners()
+
+    def running(self) -> np.ndarray:
+        """ Mask of the games that have no winner yet """
+        return self.winners == -1
+
+    def is_finished(self) -> bool:
+        return not self.running().any()
+
+    def move_player(self, player: int, moves) -> np.ndarray:
+        """
+        Moves `player` in every running game where it is still alive.
+        moves: array of shape (nb_games,) holding move codes (see MOVE_CODES) or move names.
+        Returns the indexes of the games where the player died.
+        """
+        moves = np.asarray(moves)
+        if moves.dtype.kind in 'US':
+            moves = np.array([MOVE_CODES.get(str(move), MOVE_CODES['DEATH']) for move in moves], dtype=np.int32)
+
+        games = np.nonzero(self.running() & self.alive[:, player])[0]
+        x = self.heads[games, player, 0] + _DX[moves[games]]
+        y = self.heads[games, player, 1] + _DY[moves[games]]
+
+        free = (0 <= x) & (x < self.width) & (0 <= y) & (y < self.height)
+        free[free] = self.board[games[free], x[free], y[free]] == -1
+
+        moved = games[free]
+        self.board[moved, x[free], y[free]] = player
+        self.heads[moved, player, 0] = x[free]
+        self.heads[moved, player, 1] = y[free]
+
+        dead = games[~free]
+        if len(dead):
+            self.heads[dead, player] = -1
+            self.alive[dead, player] = False
+            boards = self.board[dead]
+            boards[boards == player] = -1
+            self.board[dead] = boards
+            self._update_winners()
+        return dead
+
+    def play(self, policy: Callable[["BatchGame", int], np.ndarray], max_rounds: int = 950) -> np.ndarray:
+        """
+        Runs every game until it has a winner, in the same player order as Simulation.start.
+        policy(batch_game, player) returns the moves of `player` for all the games.
+        """
+        for _ in range(max_rounds):
+            if self.is_finished():
+                break
+            for player in range(self.nb_players):
+                self.move_player(player, policy(self, player))
+        return self.winners
+
+    def _update_winners(self):
+        alive_count = self.alive.sum(axis=1)
+        self.winners = np.where(alive_count == 1, self.alive.argmax(axis=1), -1).astype(np.int32)
+
+
+def random_policy(seed: int | None = None) -> Callable[[BatchGame, int], np.ndarray]:
+    """ Rollout policy picking a random direction in every game """
+    rng = np.random.default_rng(seed)
+    return lambda batch_game, _: rng.integers(0, 4, size=batch_game.nb_games, dtype=np.int32)
+
+
+def free_cell_policy(seed: int | None = None) -> Callable[[BatchGame, int], np.ndarray]:
+    """ Rollout policy picking a random direction among the free neighbour cells, if any """
+    rng = np.random.default_rng(seed)
+
+    def policy(batch_game: BatchGame, player: int) -> np.ndarray:
+        x = batch_game.heads[:, player, 0][:, None] + _DX[None, :4]
+        y = batch_game.heads[:, player, 1][:, None] + _DY[None, :4]
+        inside = (0 <= x) & (x < batch_game.width) & (0 <= y) & (y < batch_game.height)
+        games = np.broadcast_to(np.arange(batch_game.nb_games)[:, None], x.shape)
+        free = np.zeros(x.shape, dtype=bool)
+        free[inside] = batch_game.board[games[inside], x[inside], y[inside]] == -1
+        scores = rng.random(x.shape) + free
+        return scores.argmax(axis=1).astype(np.int32)
+
+    return policy
@@ -1,8 +1,11 @@
+import random
 from copy import deepcopy
+from functools import lru_cache
 from typing import Self
 
-from simulator_module.game.grid import Grid
-from simulator_module.game.player_turn import PlayerTurn
+from simulator_module.game.grid import Grid, BitboardGrid
+from simulator_module.game.player_turn import PlayerTurn, Move
+from simulator_module.game.trail import Trail
 from simulator_module.util.logger import Logger
 
 HEIGHT = 20
@@ -14,25 +17,65 @@ MOVES = {
     "RIGHT": (1, 0),
     "DEATH": (600, 600)
 }
+DEAD_HEAD = -1
+ZOBRIST_SEED = 0x7A0B
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(width, height, player) -> tuple[list[int], list[int]]:
+    """ 64-bit keys of a player: (trail keys, head keys), both indexed by y * width + x """
+    rng = random.Random(f"{ZOBRIST_SEED}-{width}x{height}-{player}")
+    trail_keys = [rng.getrandbits(64) for _ in range(width * height)]
+    head_keys = [rng.getrandbits(64) for _ in range(width * height)]
+    return trail_keys, head_keys
+
 
 class GameState:
+    """
+    Immutable game position. States are compared through an incrementally maintained Zobrist hash of the
+    players' trails and heads (the turn and current player are not part of the position).
+    Heads are stored packed as y * width + x, DEAD_HEAD once the player is dead.
+    """
+    __slots__ = ('_grid', '_heads', '_trails', '_current_player', '_turn', '_alive_players', '_alive_count',
+                 '_winner', '_zobrist')
 
-    def __init__(self, grid: Grid, heads: list[tuple[int, int]], trails: list[list[tuple[int, int]]],
-                 current_player: int | None = None, turn: int = 0, previous: Self = None):
+    def __init__(self, grid: Grid | BitboardGrid, heads: list[int], trails: list[Trail],
+                 current_player: int | None = None, turn: int = 0, alive_players: tuple[int, ...] | None = None,
+                 zobrist: int | None = None):
         self._grid = grid
         self._heads = heads
         self._trails = trails
         self._current_player = current_player
         self._turn = turn
-        self._previous = previous
+        if alive_players is None:
+            alive_players = tuple(player for (player, head) in enumerate(heads) if head != DEAD_HEAD)
+        self._alive_players = alive_players
+        self._alive_count = len(alive_players)
+        self._winner = alive_players[0] if self._alive_count == 1 else -1
+        self._zobrist = zobrist if zobrist is not None else self._compute_zobrist()
+
+    def _compute_zobrist(self) -> int:
+        zobrist = 0
+        width = self._grid.width
+        for (player, head) in enumerate(self._heads):
+            if head == DEAD_HEAD:
+                continue
+            (trail_keys, head_keys) = zobrist_keys(width, self._grid.height, player)
+            for (x, y) in self._trails[player]:
+                zobrist ^= trail_keys[y * width + x]
+            zobrist ^= head_keys[head]
+        return zobrist
+
+    def get_zobrist(self) -> int:
+        return self._zobrist
 
     def get_grid(self):
         return self._grid
 
-    def get_heads(self):
-        return self._heads
+    def get_heads(self) -> list[tuple[int, int]]:
+        return [self._unpack(head) for head in self._heads]
 
-    def get_trail(self, player):
+    def get_trail(self, player) -> Trail:
         return self._trails[player]
 
     def get_current_player(self):
@@ -41,38 +84,65 @@ class GameState:
     def get_turn(self):
         return self._turn
 
-    def get_alive_players(self):
-        return [player for (player, heads) in enumerate(self._heads) if heads != (-1, -1)]
+    def get_alive_players(self) -> tuple[int, ...]:
+        return self._alive_players
+
+    def get_alive_count(self) -> int:
+        return self._alive_count
 
     def get_head(self, player) -> tuple[int, int]:
-        return self._heads[player]
+        return self._unpack(self._heads[player])
 
     def is_dead(self, player) -> bool:
-        return self._heads[player] == (-1, -1)
+        return self._heads[player] == DEAD_HEAD
 
     def winner(self) -> int:
-        alive_players = [p for p, (x, y) in enumerate(self._heads) if (x, y) != (-1, -1)]
-        return alive_players[0] if len(alive_players) == 1 else -1
+        return self._winner
+
+    def _unpack(self, head: int) -> tuple[int, int]:
+        if head == DEAD_HEAD:
+            return -1, -1
+        (y, x) = divmod(head, self._grid.width)
+        return x, y
 
     def move_player(self, player, move: str) -> Self:
-        (x, y) = self._heads[player]
+        (x, y) = self._unpack(self._heads[player])
         (dx, dy) = MOVES[move]
 
         next_grid = deepcopy(self._grid)
         next_heads = self._heads[:]
-        next_trails = [trail[:] for trail in self._trails]
+        next_trails = self._trails[:]
+        next_alive_players = self._alive_players
+        next_zobrist = self._zobrist
+        width = self._grid.width
+        (trail_keys, head_keys) = zobrist_keys(width, self._grid.height, player)
 
         if self._grid.is_valid(x + dx, y + dy) and self._grid.get(x + dx, y + dy) == -1:
             next_grid.set(x + dx, y + dy, player)
-            next_player_position = (x + dx, y + dy)
-            next_heads[player] = next_player_position
-            next_trails[player] += [next_player_position]
+            cell = (y + dy) * width + x + dx
+            next_heads[player] = cell
+            next_trails[player] = self._trails[player].append((x + dx, y + dy))
+            next_zobrist ^= head_keys[self._heads[player]] ^ head_keys[cell] ^ trail_keys[cell]
         else:
-            next_heads[player] = (-1, -1)
-            next_grid.replace(player, -1)
-            next_trails[player] = []
+            next_heads[player] = DEAD_HEAD
+            next_grid.clear_player(player, self._trails[player])
+            next_trails[player] = Trail()
+            if self._heads[player] != DEAD_HEAD:
+                next_alive_players = tuple(p for p in self._alive_players if p != player)
+                next_zobrist ^= head_keys[self._heads[player]]
+                for (trail_x, trail_y) in self._trails[player]:
+                    next_zobrist ^= trail_keys[trail_y * width + trail_x]
+
+        return GameState(next_grid, next_heads, next_trails, player, self._turn + 1, next_alive_players,
+                         next_zobrist)
+
+    def __hash__(self):
+        return self._zobrist
 
-        return GameState(next_grid, next_heads, next_trails, player, self._turn + 1, self)
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return self._zobrist == other._zobrist and self._heads == other._heads
 
     def print(self, logger: Logger):
         header = "_| " + " ".join([str(i % 10) for i in range(self._grid.width)])
@@ -82,7 +152,7 @@ class GameState:
             for x in range(self._grid.width):
                 value = self._grid.get(x, y)
                 cell_str = (
-                        ('[' if 0 <= value and self._heads[value] == (x, y) else ' ')
+                        ('[' if 0 <= value and self._heads[value] == y * self._grid.width + x else ' ')
                         +
                         (str(value) if value >= 0 else '.')
                 )
@@ -90,30 +160,118 @@ class GameState:
             logger.log(line)
 
 
+class StateHistory:
+    """
+    Keeps a full GameState snapshot for every step.
+    """
+    _states: list[GameState]
+
+    def __init__(self, initial_state: GameState):
+        self._states = [initial_state]
+
+    def append(self, player, move: str, state: GameState):
+        self._states.append(state)
+
+    def last(self) -> GameState:
+        return self._states[-1]
+
+    def __len__(self):
+        return len(self._states)
+
+    def __getitem__(self, index) -> GameState:
+        return self._states[index]
+
+    def __iter__(self):
+        return iter(self._states)
+
+
+class DeltaStateHistory:
+    """
+    Keeps the move log plus one keyframe every `keyframe_interval` steps.
+    Other states are rebuilt on demand by replaying the moves from the closest keyframe.
+    """
+    _keyframe_interval: int
+    _keyframes: list[GameState]
+    _moves: list[tuple[int, str]]
+    _last_state: GameState
+    _cursor: tuple[int, GameState]
+
+    def __init__(self, initial_state: GameState, keyframe_interval: int):
+        if keyframe_interval < 1:
+            raise Exception(f"Invalid keyframe_interval: {keyframe_interval}")
+        self._keyframe_interval = keyframe_interval
+        self._keyframes = [initial_state]
+        self._moves = []
+        self._last_state = initial_state
+        self._cursor = (0, initial_state)
+
+    def append(self, player, move: str, state: GameState):
+        self._moves.append((player, move))
+        self._last_state = state
+        if len(self._moves) % self._keyframe_interval == 0:
+            self._keyframes.append(state)
+
+    def last(self) -> GameState:
+        return self._last_state
+
+    def __len__(self):
+        return len(self._moves) + 1
+
+    def __getitem__(self, index) -> GameState:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"State index out of range: {index}")
+        if index == length - 1:
+            return self._last_state
+
+        keyframe_index = index // self._keyframe_interval
+        (cursor_index, cursor_state) = self._cursor
+        if keyframe_index * self._keyframe_interval <= cursor_index <= index:
+            (start, state) = (cursor_index, cursor_state)
+        else:
+            (start, state) = (keyframe_index * self._keyframe_interval, self._keyframes[keyframe_index])
+
+        for (player, move) in self._moves[start:index]:
+            state = state.move_player(player, move)
+        self._cursor = (index, state)
+        return state
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
 class Game:
     _nb_players: int
     _initial_coords: list[tuple[int, int]]
-    _states: list[GameState]
+    _states: StateHistory | DeltaStateHistory
     _player_death_state_index: list[int]
     _player_turn_by_steps: list[PlayerTurn]
     _player_turn_counters : list[int]
 
-    def __init__(self, initial_coords: list[tuple[int, int]], logger: Logger):
+    def __init__(self, initial_coords: list[tuple[int, int]], logger: Logger,
+                 grid_class: type[Grid] | type[BitboardGrid] = BitboardGrid, keyframe_interval: int | None = None):
         self.logger = logger
         self._nb_players = len(initial_coords)
         self._initial_coords = initial_coords
         self._player_death_state_index = [-1] * self._nb_players
-        self._player_turn_by_steps = [PlayerTurn(-1, -1, 'INIT', 0)]
+        self._player_turn_by_steps = [PlayerTurn(-1, -1, Move.INIT, 0)]
         self._player_turn_counters = [-1] * self._nb_players
 
-        grid = Grid(WIDTH, HEIGHT)
-        heads = [(0, 0)] * self._nb_players
-        trails = [[(0, 0)]] * self._nb_players
+        grid = grid_class(WIDTH, HEIGHT)
+        heads = [DEAD_HEAD] * self._nb_players
+        trails = [Trail()] * self._nb_players
         for (p, (x, y)) in enumerate(self._initial_coords):
             grid.set(x, y, p)
-            heads[p] = (x, y)
-            trails[p] = [(x,y)]
-        self._states = [GameState(grid, heads, trails)]
+            heads[p] = y * WIDTH + x
+            trails[p] = Trail([(x, y)])
+        initial_state = GameState(grid, heads, trails)
+        if keyframe_interval:
+            self._states = DeltaStateHistory(initial_state, keyframe_interval)
+        else:
+            self._states = StateHistory(initial_state)
 
     def get_nb_players(self):
         return self._nb_players
@@ -125,24 +283,35 @@ class Game:
         return self._states
 
     def get_last_state(self):
-        return self._states[-1]
+        return self._states.last()
+
+    def get_winner(self):
+        return self._states.last().winner()
 
     def get_player_death_state_index(self, player):
         return self._player_death_state_index[player]
 
     def get_player_initial_coords(self, player):
-        return self._initial_coords[player] if not self._states[-1].is_dead(player) else (-1, -1)
+        return self._initial_coords[player] if not self._states.last().is_dead(player) else (-1, -1)
 
     def move_player(self, player, player_turn: PlayerTurn) -> GameState:
-        last_state = self._states[-1]
+        last_state = self._states.last()
         next_state = last_state.move_player(player, player_turn.move)
         if not last_state.is_dead(player) and next_state.is_dead(player):
             self._player_death_state_index[player] = len(self._states)
-        self._states.append(next_state)
+        self._states.append(player, player_turn.move, next_state)
         self._player_turn_counters[player] += 1
         self._player_turn_by_steps.append(player_turn)
         return next_state
 
+    def find_divergence(self, other: Self) -> int:
+        """ Index of the first state that differs between the two games, -1 if they are identical """
+        length = min(len(self._states), len(other._states))
+        for index in range(length):
+            if self._states[index] != other._states[index]:
+                return index
+        return -1 if len(self._states) == len(other._states) else length
+
     def get_player_turn_at_step(self, step) -> PlayerTurn | None:
         if not 0 <= step < len(self._player_turn_by_steps):
             return None
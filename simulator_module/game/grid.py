@@ -3,6 +3,7 @@ import copy
 from simulator_module.util.logger import Logger
 
 class Grid:
+    __slots__ = ('width', 'height', 'data')
     width: int
     height: int
     data: list[list[int]]
@@ -27,6 +28,12 @@ class Grid:
                 if self.data[x][y] == old_value:
                     self.data[x][y] = new_value
 
+    def clear_player(self, player, cells):
+        """ Empties the cells of a player, `cells` being the player's trail """
+        for (x, y) in cells:
+            if self.data[x][y] == player:
+                self.data[x][y] = -1
+
     def print(self, logger: Logger):
         header = "_| " + " ".join([str(i % 10) for i in range(self.width)])
         logger.log(header)
@@ -42,3 +49,90 @@ class Grid:
         new_grid = Grid(self.width, self.height)
         new_grid.data = copy.deepcopy(self.data)
         return new_grid
+
+
+class BitboardGrid:
+    """
+    Drop-in replacement for Grid storing one bitmask per player plus an occupancy mask.
+    Cell (x, y) is bit y * width + x. Copying the grid only copies a handful of ints.
+    """
+    __slots__ = ('width', 'height', 'occupancy', 'masks')
+    width: int
+    height: int
+    occupancy: int
+    masks: list[int]
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.occupancy = 0
+        self.masks = []
+
+    def set(self, x, y, value):
+        bit = 1 << (y * self.width + x)
+        if self.occupancy & bit:
+            for player, mask in enumerate(self.masks):
+                if mask & bit:
+                    self.masks[player] = mask & ~bit
+                    break
+        if value < 0:
+            self.occupancy &= ~bit
+            return
+        self._ensure_player(value)
+        self.masks[value] |= bit
+        self.occupancy |= bit
+
+    def get(self, x, y):
+        bit = 1 << (y * self.width + x)
+        if not self.occupancy & bit:
+            return -1
+        for player, mask in enumerate(self.masks):
+            if mask & bit:
+                return player
+        return -1
+
+    def is_valid(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def replace(self, old_value, new_value):
+        if old_value == new_value:
+            return
+        if old_value < 0:
+            cells = ((1 << (self.width * self.height)) - 1) & ~self.occupancy
+        elif old_value < len(self.masks):
+            cells = self.masks[old_value]
+            self.masks[old_value] = 0
+        else:
+            return
+        if new_value < 0:
+            self.occupancy &= ~cells
+        else:
+            self._ensure_player(new_value)
+            self.masks[new_value] |= cells
+            self.occupancy |= cells
+
+    def clear_player(self, player, cells):
+        """ Empties the cells of a player, the player's mask already indexes them so `cells` is not needed """
+        if player < len(self.masks):
+            self.occupancy &= ~self.masks[player]
+            self.masks[player] = 0
+
+    def print(self, logger: Logger):
+        header = "_| " + " ".join([str(i % 10) for i in range(self.width)])
+        logger.log(header)
+        for y in range(self.height):
+            line = f"{y % 10}|"
+            for x in range(self.width):
+                value = self.get(x, y)
+                line += " " + (str(value) if value >= 0 else '.')
+            logger.log(line)
+
+    def _ensure_player(self, player):
+        while len(self.masks) <= player:
+            self.masks.append(0)
+
+    def __deepcopy__(self, _):
+        new_grid = BitboardGrid(self.width, self.height)
+        new_grid.occupancy = self.occupancy
+        new_grid.masks = self.masks[:]
+        return new_grid
@@ -1,9 +1,36 @@
 from dataclasses import dataclass
+from enum import StrEnum
 
 
-@dataclass
+class Move(StrEnum):
+    UP = 'UP'
+    DOWN = 'DOWN'
+    LEFT = 'LEFT'
+    RIGHT = 'RIGHT'
+    DEATH = 'DEATH'
+    INIT = 'INIT'
+
+
+@dataclass(slots=True)
 class PlayerTurn:
     player_id: int
     turn: int
-    move: str
-    duration: float
\ No newline at end of file
+    move: Move | str
+    duration: float                 # seconds between the end of the input write and the end of the answer
+    timed_out: bool = False
+    write_ns: int = 0               # writing the turn input to the bot's stdin
+    wait_ns: int = 0                # from the end of the write to the first byte of the answer
+    read_ns: int = 0                # from the first byte to the end of the answer line
+    ipc_baseline_ns: int = 0        # round-trip of a no-op bot on this host, 0 if not measured
+    cpu_ns: int | None = None       # CPU time used by the bot during the turn, None if not measured
+    host_factor: float = 1.0        # how much slower than CodinGame this host is, see HostCalibration
+
+    @property
+    def decision_duration(self) -> float:
+        """ duration minus the host's IPC round-trip, in seconds """
+        return max(0, self.duration * 1e9 - self.ipc_baseline_ns) / 1e9
+
+    @property
+    def codingame_ms(self) -> float:
+        """ decision_duration as it would be on CodinGame, in ms """
+        return self.decision_duration * 1000 / self.host_factor
@@ -0,0 +1,53 @@
+import random
+from unittest import TestCase, skipUnless
+
+from simulator_module.game.game import Game, GameState
+from simulator_module.util.logger import Logger
+
+try:
+    import numpy as np
+    from simulator_module.game.batch_game import BatchGame, MOVE_NAMES, free_cell_policy
+except ImportError:
+    np = None
+
+
+def random_initial_coords(rng: random.Random, nb_players: int):
+    cells = rng.sample([(x, y) for x in range(30) for y in range(20)], nb_players)
+    return [list(cell) for cell in cells]
+
+
+@skipUnless(np is not None, "numpy is not installed")
+class Test(TestCase):
+
+    def assertSameGame(self, batch_game: "BatchGame", game_index: int, state: GameState):
+        grid = state.get_grid()
+        cells = [[grid.get(x, y) for y in range(grid.height)] for x in range(grid.width)]
+        self.assertEqual(batch_game.board[game_index].tolist(), cells)
+        self.assertEqual([tuple(head) for head in batch_game.heads[game_index].tolist()], state.get_heads())
+        self.assertEqual(batch_game.winners[game_index], state.winner())
+
+    def test_batch_game_matches_game_state(self):
+        rng = random.Random(0)
+        nb_games, nb_players = 16, 4
+        initial_coords = [random_initial_coords(rng, nb_players) for _ in range(nb_games)]
+        batch_game = BatchGame(initial_coords)
+        states = [Game([tuple(cell) for cell in coords], Logger()).get_last_state() for coords in initial_coords]
+        policy = free_cell_policy(seed=1)
+
+        while not batch_game.is_finished():
+            for player in range(nb_players):
+                moves = policy(batch_game, player)
+                if rng.random() < 0.02:
+                    moves[rng.randrange(nb_games)] = MOVE_NAMES.index('DEATH')
+                batch_game.move_player(player, moves)
+                for (game_index, state) in enumerate(states):
+                    if state.winner() == -1 and not state.is_dead(player):
+                        states[game_index] = state.move_player(player, MOVE_NAMES[moves[game_index]])
+                    self.assertSameGame(batch_game, game_index, states[game_index])
+
+    def test_move_names_are_accepted(self):
+        batch_game = BatchGame([[[0, 0], [5, 5]]])
+        dead = batch_game.move_player(0, ['LEFT'])
+        self.assertEqual(dead.tolist(), [0])
+        self.assertEqual(batch_game.winners.tolist(), [1])
+        self.assertEqual(batch_game.board[0, 0, 0], -1)
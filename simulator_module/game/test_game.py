@@ -0,0 +1,105 @@
+import random
+from unittest import TestCase
+
+from simulator_module.game.game import Game, GameState
+from simulator_module.game.grid import Grid
+from simulator_module.game.player_turn import PlayerTurn
+from simulator_module.util.logger import Logger
+
+MOVES = ['UP', 'DOWN', 'LEFT', 'RIGHT']
+INITIAL_COORDS = [(2, 2), (27, 2), (2, 17), (27, 17)]
+
+
+def play_random_game(game: Game, seed: int):
+    rng = random.Random(seed)
+    turns = [0] * game.get_nb_players()
+    while game.get_last_state().winner() == -1:
+        for player in range(game.get_nb_players()):
+            if game.get_last_state().winner() != -1 or game.get_last_state().is_dead(player):
+                continue
+            game.move_player(player, PlayerTurn(player, turns[player], rng.choice(MOVES), 0))
+            turns[player] += 1
+
+
+def cells(state: GameState):
+    grid = state.get_grid()
+    return [[grid.get(x, y) for y in range(grid.height)] for x in range(grid.width)]
+
+
+class Test(TestCase):
+
+    def assertSameState(self, expected: GameState, actual: GameState):
+        self.assertEqual(expected.get_heads(), actual.get_heads())
+        self.assertEqual(expected.get_turn(), actual.get_turn())
+        self.assertEqual(expected.get_current_player(), actual.get_current_player())
+        for player in range(len(expected.get_heads())):
+            self.assertEqual(list(expected.get_trail(player)), list(actual.get_trail(player)))
+        self.assertEqual(cells(expected), cells(actual))
+
+    def test_bitboard_game_matches_list_grid_game(self):
+        for seed in range(5):
+            expected = Game(INITIAL_COORDS, Logger(), grid_class=Grid)
+            actual = Game(INITIAL_COORDS, Logger())
+            play_random_game(expected, seed)
+            play_random_game(actual, seed)
+            self.assertEqual(len(expected.get_states()), len(actual.get_states()))
+            for expected_state, actual_state in zip(expected.get_states(), actual.get_states()):
+                self.assertSameState(expected_state, actual_state)
+
+    def test_delta_history_matches_snapshots(self):
+        for seed in range(5):
+            expected = Game(INITIAL_COORDS, Logger())
+            actual = Game(INITIAL_COORDS, Logger(), keyframe_interval=7)
+            play_random_game(expected, seed)
+            play_random_game(actual, seed)
+            length = len(expected.get_states())
+            self.assertEqual(length, len(actual.get_states()))
+            indexes = list(range(length)) + random.Random(seed).sample(range(length), length // 2) + [-1]
+            for index in indexes:
+                self.assertSameState(expected.get_states()[index], actual.get_states()[index])
+            for player in range(4):
+                self.assertEqual(expected.get_player_death_state_index(player),
+                                 actual.get_player_death_state_index(player))
+
+    def test_alive_players_and_winner_follow_heads(self):
+        for seed in range(5):
+            game = Game(INITIAL_COORDS, Logger())
+            play_random_game(game, seed)
+            for state in game.get_states():
+                alive_players = tuple(p for (p, head) in enumerate(state.get_heads()) if head != (-1, -1))
+                self.assertEqual(state.get_alive_players(), alive_players)
+                self.assertEqual(state.get_alive_count(), len(alive_players))
+                self.assertEqual(state.winner(), alive_players[0] if len(alive_players) == 1 else -1)
+            self.assertEqual(game.get_winner(), game.get_last_state().winner())
+
+    def test_zobrist_is_maintained_incrementally(self):
+        for seed in range(5):
+            game = Game(INITIAL_COORDS, Logger())
+            play_random_game(game, seed)
+            for state in game.get_states():
+                self.assertEqual(state.get_zobrist(), state._compute_zobrist())
+
+    def test_states_compare_by_position(self):
+        game = Game(INITIAL_COORDS, Logger())
+        state = game.get_last_state()
+        other = state.move_player(0, 'RIGHT').move_player(1, 'LEFT')
+        same = state.move_player(1, 'LEFT').move_player(0, 'RIGHT')
+        self.assertEqual(other, same)
+        self.assertEqual(len({state, other, same}), 2)
+        self.assertNotEqual(state, other)
+        self.assertNotEqual(other, state.move_player(0, 'DOWN').move_player(1, 'LEFT'))
+
+    def test_find_divergence(self):
+        game = Game(INITIAL_COORDS, Logger())
+        other = Game(INITIAL_COORDS, Logger(), keyframe_interval=3)
+        play_random_game(game, 1)
+        play_random_game(other, 1)
+        self.assertEqual(game.find_divergence(other), -1)
+
+        game = Game(INITIAL_COORDS, Logger())
+        other = Game(INITIAL_COORDS, Logger())
+        for (player, move) in [(0, 'RIGHT'), (1, 'LEFT'), (2, 'UP')]:
+            game.move_player(player, PlayerTurn(player, 0, move, 0))
+        for (player, move) in [(0, 'RIGHT'), (1, 'DOWN'), (2, 'UP')]:
+            other.move_player(player, PlayerTurn(player, 0, move, 0))
+        self.assertEqual(game.find_divergence(other), 2)
@@ -0,0 +1,64 @@
+import random
+from copy import deepcopy
+from unittest import TestCase
+
+from simulator_module.game.grid import Grid, BitboardGrid
+
+
+class Test(TestCase):
+
+    def test_bitboard_set_get(self):
+        grid = BitboardGrid(30, 20)
+        self.assertEqual(grid.get(3, 4), -1)
+        grid.set(3, 4, 2)
+        self.assertEqual(grid.get(3, 4), 2)
+        grid.set(3, 4, 0)
+        self.assertEqual(grid.get(3, 4), 0)
+        grid.set(3, 4, -1)
+        self.assertEqual(grid.get(3, 4), -1)
+        self.assertEqual(grid.occupancy, 0)
+
+    def test_bitboard_replace(self):
+        grid = BitboardGrid(30, 20)
+        grid.set(0, 0, 1)
+        grid.set(29, 19, 1)
+        grid.set(5, 5, 0)
+        grid.replace(1, -1)
+        self.assertEqual(grid.get(0, 0), -1)
+        self.assertEqual(grid.get(29, 19), -1)
+        self.assertEqual(grid.get(5, 5), 0)
+
+    def test_bitboard_deepcopy_is_independent(self):
+        grid = BitboardGrid(30, 20)
+        grid.set(1, 1, 0)
+        copy = deepcopy(grid)
+        copy.set(2, 2, 1)
+        self.assertEqual(grid.get(2, 2), -1)
+        self.assertEqual(copy.get(1, 1), 0)
+
+    def test_bitboard_matches_grid(self):
+        rng = random.Random(42)
+        grid = Grid(30, 20)
+        bitboard = BitboardGrid(30, 20)
+        for _ in range(2000):
+            if rng.random() < 0.05:
+                old_value, new_value = rng.randint(-1, 3), rng.randint(-1, 3)
+                grid.replace(old_value, new_value)
+                bitboard.replace(old_value, new_value)
+            else:
+                x, y, value = rng.randrange(30), rng.randrange(20), rng.randint(-1, 3)
+                grid.set(x, y, value)
+                bitboard.set(x, y, value)
+        for x in range(30):
+            for y in range(20):
+                self.assertEqual(grid.get(x, y), bitboard.get(x, y))
+
+    def test_clear_player_only_clears_trail_cells(self):
+        for grid in [Grid(30, 20), BitboardGrid(30, 20)]:
+            trail = [(0, 0), (1, 0), (1, 1)]
+            for (x, y) in trail:
+                grid.set(x, y, 1)
+            grid.set(2, 1, 0)
+            grid.clear_player(1, trail)
+            self.assertEqual([grid.get(x, y) for (x, y) in trail], [-1, -1, -1])
+            self.assertEqual(grid.get(2, 1), 0)
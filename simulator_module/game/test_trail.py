@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from simulator_module.game.trail import Trail
+
+
+class Test(TestCase):
+
+    def test_append_keeps_previous_trail_unchanged(self):
+        trail = Trail([(0, 0)])
+        longer = trail.append((1, 0))
+        self.assertEqual(list(trail), [(0, 0)])
+        self.assertEqual(list(longer), [(0, 0), (1, 0)])
+        self.assertEqual(longer[-1], (1, 0))
+        self.assertEqual(longer[0:1], [(0, 0)])
+
+    def test_append_shares_prefix(self):
+        trail = Trail([(0, 0)])
+        longer = trail.append((1, 0)).append((2, 0))
+        self.assertIs(trail._cells, longer._cells)
+
+    def test_diverging_append_copies(self):
+        trail = Trail([(0, 0)])
+        right = trail.append((1, 0))
+        down = trail.append((0, 1))
+        self.assertEqual(list(right), [(0, 0), (1, 0)])
+        self.assertEqual(list(down), [(0, 0), (0, 1)])
+        self.assertEqual(trail.append((1, 0)), right)
+        with self.assertRaises(IndexError):
+            _ = down[2]
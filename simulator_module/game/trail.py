@@ -0,0 +1,50 @@
+from collections.abc import Sequence
+from itertools import islice
+from typing import Self
+
+
+class Trail(Sequence):
+    """
+    Persistent, append-only trail of a player.
+    Trails derived from one another share a single growing list of cells, each Trail only knows how many of
+    them it owns. Appending is O(1) unless the shared list already diverged, in which case the prefix is copied.
+    """
+    __slots__ = ('_cells', '_length')
+    _cells: list[tuple[int, int]]
+    _length: int
+
+    def __init__(self, cells: list[tuple[int, int]] | None = None, length: int | None = None):
+        self._cells = cells if cells is not None else []
+        self._length = len(self._cells) if length is None else length
+
+    def append(self, cell: tuple[int, int]) -> Self:
+        cells = self._cells
+        if self._length == len(cells):
+            cells.append(cell)
+        elif cells[self._length] != cell:
+            cells = cells[:self._length]
+            cells.append(cell)
+        return Trail(cells, self._length + 1)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._cells[:self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Trail index out of range: {index}")
+        return self._cells[index]
+
+    def __iter__(self):
+        return islice(self._cells, self._length)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for (a, b) in zip(self, other))
+
+    def __repr__(self):
+        return f"Trail({list(self)})"
@@ -0,0 +1,152 @@
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+
+from simulator_module.ai.log_store import decode_logs
+from simulator_module.game.game import Game
+from simulator_module.game.player_turn import PlayerTurn, Move
+from simulator_module.util.logger import QuietLogger
+
+REPLAY_EXTENSION = '.tronreplay'
+MAGIC = b'TRONRPLY'
+VERSION = 1
+# magic, version, length of the JSON metadata that follows
+HEADER = struct.Struct('<8sHI')
+# player_id, move, timed_out, turn, duration, write_ns, wait_ns, read_ns, ipc_baseline_ns, cpu_ns (-1 if not
+# measured), host_factor, length of the zlib-compressed stderr that follows
+STEP = struct.Struct('<bBBIdQQQQqdI')
+# offset of the index, number of steps, winner, magic
+TRAILER = struct.Struct('<QIi8s')
+MOVE_CODES = list(Move)
+
+
+class ReplayWriter:
+    """
+    Writes a game as it is played: a header with the metadata of the game, then one record per step (its PlayerTurn
+    and compressed stderr), and on close an index of the record offsets followed by a fixed-size trailer.
+    """
+
+    def __init__(self, path: str, initial_coords: list[tuple[int, int]], program_paths: list[str]):
+        self._file = open(path, 'wb')
+        metadata = json.dumps({
+            "initial_coords": [list(coords) for coords in initial_coords],
+            "program_paths": program_paths,
+        }).encode('utf-8')
+        self._file.write(HEADER.pack(MAGIC, VERSION, len(metadata)))
+        self._file.write(metadata)
+        self._offset = HEADER.size + len(metadata)
+        # Record of step s at offsets[s-1], step 0 being the initial state
+        self._offsets = array('Q')
+
+    def write_step(self, player_turn: PlayerTurn, stderr: bytes | bytearray | None):
+        data = zlib.compress(stderr, 1) if stderr else b""
+        cpu_ns = player_turn.cpu_ns if player_turn.cpu_ns is not None else -1
+        self._file.write(STEP.pack(player_turn.player_id, MOVE_CODES.index(Move(player_turn.move)),
+                                   player_turn.timed_out, player_turn.turn, player_turn.duration, player_turn.write_ns,
+                                   player_turn.wait_ns, player_turn.read_ns, player_turn.ipc_baseline_ns, cpu_ns,
+                                   player_turn.host_factor, len(data)))
+        self._file.write(data)
+        self._offsets.append(self._offset)
+        self._offset += STEP.size + len(data)
+
+    def close(self, winner: int):
+        if self._file is None:
+            return
+        if sys.byteorder != 'little':
+            self._offsets.byteswap()
+        self._file.write(self._offsets.tobytes())
+        self._file.write(TRAILER.pack(self._offset, len(self._offsets), winner, MAGIC))
+        self._file.close()
+        self._file = None
+
+
+class ReplayReader:
+    """
+    Game saved by a ReplayWriter. The file is mapped in memory and only its header and trailer are read when opened:
+    steps are decoded when asked for, and the Game is rebuilt from the moves the first time it is used.
+    Exposes the game and logs the same way as Simulation.
+    """
+
+    def __init__(self, path: str, keyframe_interval: int | None = 50):
+        self._keyframe_interval = keyframe_interval
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header(path)
+        except Exception:
+            self._mmap.close()
+            raise
+        self._game: Game | None = None
+
+    def _read_header(self, path: str):
+        if len(self._mmap) < HEADER.size + TRAILER.size:
+            raise Exception(f"Not a replay file: {path}")
+        (magic, version, metadata_length) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise Exception(f"Not a replay file: {path}")
+        if version != VERSION:
+            raise Exception(f"Unsupported replay version {version}: {path}")
+        (self._index_offset, self._steps, self._winner, magic) = TRAILER.unpack_from(self._mmap,
+                                                                                    len(self._mmap) - TRAILER.size)
+        if magic != MAGIC:
+            raise Exception(f"Incomplete replay, the game was not saved until its end: {path}")
+        metadata = json.loads(self._mmap[HEADER.size:HEADER.size + metadata_length])
+        self.initial_coords: list[tuple[int, int]] = [tuple(coords) for coords in metadata["initial_coords"]]
+        self.program_paths: list[str] = metadata["program_paths"]
+
+    def __len__(self):
+        """ Number of states of the game, as len(game.get_states()) """
+        return self._steps + 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def get_winner(self) -> int:
+        return self._winner
+
+    def _record_offset(self, step: int) -> int | None:
+        if not 1 <= step <= self._steps:
+            return None
+        return struct.unpack_from('<Q', self._mmap, self._index_offset + (step - 1) * 8)[0]
+
+    def get_player_turn_at_step(self, step: int) -> PlayerTurn | None:
+        offset = self._record_offset(step)
+        if offset is None:
+            return None
+        (player_id, move, timed_out, turn, duration, write_ns, wait_ns, read_ns, ipc_baseline_ns, cpu_ns, host_factor,
+         _) = STEP.unpack_from(self._mmap, offset)
+        return PlayerTurn(player_id, turn, MOVE_CODES[move], duration, bool(timed_out), write_ns, wait_ns, read_ns,
+                          ipc_baseline_ns, cpu_ns if cpu_ns >= 0 else None, host_factor)
+
+    def get_stderr_at_step(self, step: int) -> bytes | None:
+        offset = self._record_offset(step)
+        if offset is None:
+            return None
+        length = STEP.unpack_from(self._mmap, offset)[-1]
+        start = offset + STEP.size
+        return zlib.decompress(self._mmap[start:start + length]) if length else b""
+
+    def get_logs_at(self, step, player_id) -> list[str] | None:
+        player_turn = self.get_player_turn_at_step(step)
+        if player_turn is None or player_turn.player_id != player_id:
+            return None
+        return decode_logs(self.get_stderr_at_step(step))
+
+    @property
+    def game(self) -> Game:
+        if self._game is None:
+            game = Game(self.initial_coords, QuietLogger(), keyframe_interval=self._keyframe_interval)
+            for step in range(1, self._steps + 1):
+                player_turn = self.get_player_turn_at_step(step)
+                game.move_player(player_turn.player_id, player_turn)
+            self._game = game
+        return self._game
+
+    def close(self):
+        self._mmap.close()
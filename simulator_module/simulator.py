@@ -1,3 +1,4 @@
+import asyncio
 import json
 import os
 import sys
@@ -6,17 +7,31 @@ import traceback
 from typing import Callable
 
 from simulator_module.ai.ai import AI
-from simulator_module.config import Config
+from simulator_module.ai.async_ai import AsyncAI
+from simulator_module.ai.calibration import get_calibration
+from simulator_module.ai.in_process_ai import InProcessAI
+from simulator_module.ai.io_loop import IOLoop
+from simulator_module.ai.ipc_baseline import measure_ipc_baseline
+from simulator_module.ai.launchers import get_registry
+from simulator_module.ai.log_store import LogStore
+from simulator_module.ai.pool import BotPool
+from simulator_module.ai.zygote import get_zygote, zygote_available
+from simulator_module.config import Config, AiConfig
 from simulator_module.game.game import Game
+from simulator_module.game.player_turn import PlayerTurn
+from simulator_module.replay import ReplayWriter, REPLAY_EXTENSION
 from simulator_module.util.logger import Logger
+from simulator_module.util.progress import ThrottledProgress
 
 HEIGHT = 20
 WIDTH = 30
 
 class Simulation:
 
-    def __init__(self, config: Config, keep_log_files, logger = None):
+    def __init__(self, config: Config, keep_log_files, logger = None, pool: BotPool | None = None):
         self._config = config
+        # Running bots shared between simulations, used for the AIs configured as reusable
+        self._pool = pool
         log_directory = None
         if keep_log_files:
             log_directory = f'logs/run_{time.strftime("%Y%m%d-%H%M%S")}'
@@ -32,27 +47,116 @@ class Simulation:
 
         self._logger.log(f"Config: {config}")
 
-        self.ais: list[AI] = []
-        heads = []
-        for (player, ai_config) in enumerate(config.ais):
-            self._logger.log(ai_config.program_path)
-            self.ais.append(AI(player, ai_config.program_path, ai_config.initial_coords, log_directory, self._logger))
-            heads.append(ai_config.initial_coords)
-
-        self.game = Game(heads, self._logger)
+        self._log_directory = log_directory
+        self._replay_path = config.replay_file
+        if self._replay_path is None and log_directory:
+            self._replay_path = f'{log_directory}/game{REPLAY_EXTENSION}'
+        self._replay: ReplayWriter | None = None
+        self._ipc_baseline_ns = measure_ipc_baseline(self._logger) if config.measure_ipc_baseline else 0
+        self._host_factor = get_calibration(self._logger).factor if config.calibrate_host else 1.0
+
+        # Compiles the bots that need it (once, see LauncherRegistry) before any of them is started
+        get_registry().prepare([ai_config.program_path for ai_config in config.ais])
+
+        self._io_loop = IOLoop()
+        self._zygote = None
+        if config.use_zygote:
+            if zygote_available():
+                self._zygote = get_zygote()
+            else:
+                self._logger.log("Zygote launcher is not available on this platform, bots are started normally")
+        self.ais: list[AI | AsyncAI | InProcessAI] = []
+        heads = [ai_config.initial_coords for ai_config in config.ais]
+        self.game = Game(heads, self._logger, keyframe_interval=config.keyframe_interval)
+
+    def _ai_arguments(self, player, ai_config: AiConfig) -> dict:
+        self._logger.log(ai_config.program_path)
+        return dict(player_id=player, path=ai_config.program_path, initial_coords=ai_config.initial_coords,
+                    log_directory=self._log_directory, logger=self._logger, ipc_baseline_ns=self._ipc_baseline_ns,
+                    log_store=LogStore(self._config.log_memory_budget, self._config.compress_logs),
+                    cpus=ai_config.cpus, host_factor=self._host_factor,
+                    **ai_config.timeouts())
+
+    def _create_ai(self, player, ai_config: AiConfig) -> AI | InProcessAI:
+        if ai_config.in_process:
+            # No pipes between the simulator and an in-process bot: the IPC baseline does not apply to it
+            return InProcessAI(**(self._ai_arguments(player, ai_config) | {'ipc_baseline_ns': 0}))
+        return AI(io_loop=self._io_loop, zygote=self._zygote, pool=self._pool if ai_config.reusable else None,
+                  **self._ai_arguments(player, ai_config))
 
     def start(self, progress_callback: Callable[[int, int, str],None] = None):
+        self.ais = []
+        try:
+            # One at a time: if a bot cannot be started, stop() still stops the ones before it
+            for (player, ai_config) in enumerate(self._config.ais):
+                self.ais.append(self._create_ai(player, ai_config))
+            self._open_replay()
+            turns = self._play(progress_callback)
+            request = next(turns, None)
+            while request is not None:
+                (player, nb_players, players_info) = request
+                request = self._send(turns, self.ais[player].ask(nb_players, players_info))
+        finally:
+            self._flush_progress(progress_callback)
+            self.stop()
+
+    async def run_async(self, progress_callback: Callable[[int, int, str],None] = None):
+        """
+        Same as start, with asyncio-driven bots: many games can run concurrently on one event loop.
+        Every bot runs in its own process here, in_process and reusable are ignored.
+        """
+        self.ais = [AsyncAI(**self._ai_arguments(player, ai_config))
+                    for (player, ai_config) in enumerate(self._config.ais)]
+        try:
+            for ai in self.ais:
+                await ai.start()
+            self._open_replay()
+            turns = self._play(progress_callback)
+            request = next(turns, None)
+            while request is not None:
+                (player, nb_players, players_info) = request
+                request = self._send(turns, await self.ais[player].ask(nb_players, players_info))
+        finally:
+            self._flush_progress(progress_callback)
+            self.stop()
+            await asyncio.gather(*(ai.wait_closed() for ai in self.ais))
+
+    def _open_replay(self):
+        if self._replay_path:
+            self._replay = ReplayWriter(self._replay_path, self.game.get_initial_coords(),
+                                        [ai_config.program_path for ai_config in self._config.ais])
+
+    @staticmethod
+    def _flush_progress(progress_callback: Callable[[int, int, str],None] | None):
+        # A throttled callback may hold back the last steps of a game that did not end normally
+        if isinstance(progress_callback, ThrottledProgress):
+            progress_callback.flush()
+
+    @staticmethod
+    def _send(turns, player_turn: PlayerTurn):
+        try:
+            return turns.send(player_turn)
+        except StopIteration:
+            return None
+
+    def _play(self, progress_callback: Callable[[int, int, str],None] | None):
+        """
+        Game loop, independent of the way bots are driven:
+        yields (player, nb_players, players_info) for every turn to play and expects the PlayerTurn back.
+        """
         self._logger.log("Starting simulation")
         step = 0
         if progress_callback:
             progress_callback(step, -1, "start")
 
+        nb_players = self.game.get_nb_players()
         while self.game.get_last_state().winner() == -1:
-            for player in range(self.game.get_nb_players()):
-                if self.game.get_last_state().winner() != -1:
+            for player in range(nb_players):
+                last_state = self.game.get_last_state()
+                if last_state.winner() != -1:
                     continue
 
-                if self.game.get_last_state().is_dead(player):
+                if last_state.is_dead(player):
                     self.ais[player].stop()
                     step +=1
                     if progress_callback:
@@ -60,14 +164,18 @@ class Simulation:
                     continue
 
                 players_info = []
-                for p in range(self.game.get_nb_players()):
-                    (x1, y1) = self.game.get_last_state().get_head(p)
+                for p in range(nb_players):
+                    (x1, y1) = last_state.get_head(p)
                     (x0, y0) = self.game.get_player_initial_coords(p)
                     players_info.append((x0, y0, x1, y1))
 
-                player_turn = self.ais[player].ask(self.game.get_nb_players(), players_info)
-                self._logger.log(f"Player move: {player_turn.move} - Elapsed time: {player_turn.duration*1000:.3f}")
+                player_turn = yield player, nb_players, players_info
+                self._logger.log(f"Player move: {player_turn.move} - Elapsed time: {player_turn.duration*1000:.3f}"
+                                 f" - Decision time: {player_turn.decision_duration*1000:.3f}"
+                                 f" - CodinGame time: {player_turn.codingame_ms:.3f}")
                 self.game.move_player(player, player_turn)
+                if self._replay:
+                    self._replay.write_step(player_turn, self.ais[player].get_stderr_at_turn(player_turn.turn))
 
                 step += 1
                 if progress_callback:
@@ -76,11 +184,20 @@ class Simulation:
         step = 950 # max turn is 950
         if progress_callback:
             progress_callback(step, self.game.get_last_state().winner(), "win")
-        self.stop()
 
     def stop(self):
         for ai in self.ais:
             ai.stop()
+        self._io_loop.close()
+        if self._replay:
+            self._replay.close(self.game.get_winner())
+            self._replay = None
+
+    def close(self):
+        """ Stops the game and releases the logs of its AIs, which cannot be read anymore """
+        self.stop()
+        for ai in self.ais:
+            ai.close_logs()
 
     def print_all_states(self):
         for state in self.game.get_states():
@@ -122,10 +239,8 @@ def main():
 
         logger.log(f"Config: {config}")
 
-        simulation = Simulation(config, logger)
+        simulation = Simulation(config, True, logger)
         simulation.start(progress_function(logger))
-
-        input("Press any key to print all states...")
         simulation.print_all_states()
 
     except Exception:
@@ -133,7 +248,7 @@ def main():
         exit_code=1
     finally:
         if simulation:
-            simulation.stop()
+            simulation.close()
         logger.close()
         sys.exit(exit_code)
 
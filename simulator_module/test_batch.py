@@ -0,0 +1,48 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from simulator_module.batch import run_batch, play_game
+from simulator_module.replay import ReplayReader
+from simulator_module.test_simulator import fibonacci_config
+
+
+class Test(TestCase):
+
+    def json_config(self) -> dict:
+        config = fibonacci_config()
+        return {"measure_ipc_baseline": False,
+                "ais": [{"program_path": ai.program_path, "initial_coords": ai.initial_coords} for ai in config.ais]}
+
+    def test_play_game_reports_deaths_and_timings(self):
+        result = play_game(self.json_config(), 3, None)
+        self.assertEqual(result["game"], 3)
+        loser = result["players"][1 - result["winner"]]
+        self.assertEqual(loser["death_step"], result["steps"])
+        for player in result["players"]:
+            self.assertEqual(player["timeouts"], 0)
+            self.assertGreater(player["turns"], 0)
+            self.assertGreater(player["decision_ms"]["max"], 0)
+
+    def test_run_batch_writes_one_line_per_game(self):
+        output = io.StringIO()
+        run_batch(self.json_config(), 3, 2, output)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(result["game"] for result in results), [0, 1, 2])
+        # Same initial coordinates and deterministic bots: same game every time
+        self.assertEqual(len({(result["winner"], result["steps"]) for result in results}), 1)
+
+    def test_every_game_saves_its_own_replay(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        json_config = self.json_config()
+        json_config["replay_file"] = os.path.join(directory.name, "game.tronreplay")
+        output = io.StringIO()
+        run_batch(json_config, 3, 2, output)
+        for result in map(json.loads, output.getvalue().splitlines()):
+            with ReplayReader(os.path.join(directory.name, f"game_{result['game']}.tronreplay")) as replay:
+                self.assertEqual(len(replay), result["steps"] + 1)
+                self.assertEqual(replay.get_winner(), result["winner"])
+        self.assertFalse(os.path.exists(json_config["replay_file"]))
@@ -0,0 +1,67 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from simulator_module.game.player_turn import PlayerTurn, Move
+from simulator_module.replay import ReplayWriter, ReplayReader
+from simulator_module.simulator import Simulation
+from simulator_module.test_simulator import fibonacci_config
+from simulator_module.util.logger import Logger
+
+PAINT_TURN = b"".join(f"#PAINT([{i % 30},{i % 20}],color=#ff0000)\n".encode('utf-8') for i in range(200))
+
+
+class Test(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'game.tronreplay')
+
+    def test_simulation_saves_its_game(self):
+        config = fibonacci_config()
+        config.replay_file = self.path
+        simulation = Simulation(config, False, Logger())
+        simulation.start()
+
+        with ReplayReader(self.path) as replay:
+            self.assertEqual(len(replay), len(simulation.game.get_states()))
+            self.assertEqual(replay.get_winner(), simulation.game.get_winner())
+            self.assertEqual(replay.initial_coords, [tuple(coords) for coords in simulation.game.get_initial_coords()])
+            self.assertEqual(replay.game.find_divergence(simulation.game), -1)
+            for step in range(1, len(replay)):
+                player_turn = simulation.game.get_player_turn_at_step(step)
+                self.assertEqual(replay.get_player_turn_at_step(step), player_turn)
+                self.assertEqual(replay.get_logs_at(step, player_turn.player_id),
+                                 simulation.get_logs_at(step, player_turn.player_id))
+            self.assertIsNone(replay.get_player_turn_at_step(len(replay)))
+
+    def test_steps_are_read_on_demand(self):
+        writer = ReplayWriter(self.path, [(3, 10), (20, 10)], ["a.py", "b.py"])
+        for step in range(950):
+            player_turn = PlayerTurn(step % 2, step // 2, Move.UP if step < 949 else Move.DEATH, 0.001,
+                                     cpu_ns=None if step % 3 else step)
+            writer.write_step(player_turn, PAINT_TURN if step % 2 else b"")
+        writer.close(winner=0)
+
+        with ReplayReader(self.path) as replay:
+            self.assertEqual(len(replay), 951)
+            self.assertEqual(replay.program_paths, ["a.py", "b.py"])
+            # Step 0 is the initial state: the record of the (step - 1)th move is read
+            self.assertEqual(replay.get_stderr_at_step(500), PAINT_TURN)
+            self.assertEqual(replay.get_stderr_at_step(501), b"")
+            self.assertEqual(replay.get_player_turn_at_step(301).cpu_ns, 300)
+            self.assertIsNone(replay.get_player_turn_at_step(302).cpu_ns)
+            self.assertEqual(replay.get_player_turn_at_step(950).move, Move.DEATH)
+            self.assertIsNone(replay.get_logs_at(500, 0))
+            self.assertIn("#PAINT([1,1],color=#ff0000)", replay.get_logs_at(500, 1))
+        # Stderr is compressed: the paint commands repeat from a turn to the next
+        self.assertLess(os.path.getsize(self.path), 475 * len(PAINT_TURN) // 10)
+
+    def test_unfinished_replay_is_rejected(self):
+        writer = ReplayWriter(self.path, [(3, 10), (20, 10)], ["a.py", "b.py"])
+        writer.write_step(PlayerTurn(0, 0, Move.UP, 0.001), b"thinking\n")
+        writer._file.flush()
+        with self.assertRaises(Exception):
+            ReplayReader(self.path)
+        writer.close(winner=-1)
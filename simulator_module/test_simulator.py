@@ -0,0 +1,102 @@
+import asyncio
+import os
+from unittest import mock
+
+from simulator_module.ai.testing import BotTestCase, EXITING_BOT
+from simulator_module.config import Config
+from simulator_module.game.player_turn import Move
+from simulator_module.simulator import Simulation
+from simulator_module.util.logger import Logger
+
+SCRIPTS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+
+
+def fibonacci_config(in_process: bool = False) -> Config:
+    return Config({
+        "measure_ipc_baseline": False,
+        "ais": [
+            {"program_path": os.path.join(SCRIPTS_DIRECTORY, 'fibonacci.py'), "initial_coords": [3, 10],
+             "in_process": in_process},
+            {"program_path": os.path.join(SCRIPTS_DIRECTORY, 'fibonacci.py'), "initial_coords": [20, 10],
+             "in_process": in_process},
+        ]
+    })
+
+
+class Test(BotTestCase):
+
+    def test_run_async_plays_the_same_game(self):
+        simulation = Simulation(fibonacci_config(), False, Logger())
+        simulation.start()
+
+        async def run_games():
+            simulations = [Simulation(fibonacci_config(), False, Logger()) for _ in range(3)]
+            await asyncio.gather(*(async_simulation.run_async() for async_simulation in simulations))
+            return simulations
+
+        for async_simulation in asyncio.run(run_games()):
+            self.assertEqual(async_simulation.game.find_divergence(simulation.game), -1)
+            self.assertEqual(async_simulation.game.get_winner(), simulation.game.get_winner())
+            self.assertEqual(async_simulation.get_logs_at(1, 0), simulation.get_logs_at(1, 0))
+
+    def test_in_process_bots_play_the_same_game(self):
+        simulation = Simulation(fibonacci_config(), False, Logger())
+        simulation.start()
+        in_process_simulation = Simulation(fibonacci_config(in_process=True), False, Logger())
+        in_process_simulation.start()
+
+        self.assertEqual(in_process_simulation.game.find_divergence(simulation.game), -1)
+        self.assertEqual(in_process_simulation.get_logs_at(1, 0), simulation.get_logs_at(1, 0))
+
+    def test_in_process_bots_have_no_ipc_baseline(self):
+        config = fibonacci_config()
+        config.measure_ipc_baseline = True
+        config.ais[0].in_process = True
+        with mock.patch('simulator_module.simulator.measure_ipc_baseline', return_value=50_000):
+            simulation = Simulation(config, False, Logger())
+        simulation.start()
+
+        player_turns = [simulation.game.get_player_turn_at_step(step)
+                        for step in range(1, len(simulation.game.get_states()))]
+        self.assertEqual({player_turn.ipc_baseline_ns for player_turn in player_turns if player_turn.player_id == 0},
+                         {0})
+        self.assertEqual({player_turn.ipc_baseline_ns for player_turn in player_turns if player_turn.player_id == 1},
+                         {50_000})
+
+    def test_exited_bot_loses(self):
+        config = fibonacci_config()
+        config.ais[0].program_path = self.write_bot(EXITING_BOT)
+        simulation = Simulation(config, False, Logger())
+        simulation.start()
+        async_simulation = Simulation(config, False, Logger())
+        asyncio.run(async_simulation.run_async())
+
+        for game in (simulation.game, async_simulation.game):
+            self.assertEqual(game.get_player_turn_at_step(1).move, Move.DEATH)
+            self.assertEqual(game.get_winner(), 1)
+
+    def test_started_bots_are_stopped_when_another_cannot_start(self):
+        config = fibonacci_config()
+        config.ais[1].program_path = os.path.join(SCRIPTS_DIRECTORY, 'missing_bot')
+        simulation = Simulation(config, False, Logger())
+        with self.assertRaises(OSError):
+            simulation.start()
+        self.assertEqual(len(simulation.ais), 1)
+        self.assertIsNotNone(simulation.ais[0]._process.poll())
+
+        async_simulation = Simulation(config, False, Logger())
+        with self.assertRaises(OSError):
+            asyncio.run(async_simulation.run_async())
+        self.assertIsNotNone(async_simulation.ais[0]._process.returncode)
+
+    def test_close_releases_the_spilled_logs(self):
+        config = fibonacci_config()
+        config.log_memory_budget = 0
+        simulation = Simulation(config, False, Logger())
+        simulation.start()
+        # The logs are still read once the game has ended
+        self.assertIsNotNone(simulation.get_logs_at(1, 0))
+        self.assertIsNotNone(simulation.ais[0]._logs._file)
+        simulation.close()
+        for ai in simulation.ais:
+            self.assertIsNone(ai._logs._file)
@@ -17,3 +17,10 @@ class Logger:
     def close(self):
         if self._log_file:
             self._log_file.close()
+
+
+class QuietLogger(Logger):
+    """ Drops every message, for headless runs where per-move logs would only slow games down """
+
+    def log(self, *args):
+        pass
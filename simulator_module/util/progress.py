@@ -0,0 +1,42 @@
+import time
+from typing import Callable
+
+# (step, player, move or event name), as passed to a Simulation progress callback
+ProgressEvent = tuple[int, int, str]
+# Events ending a game: always delivered at once
+FINAL_EVENTS = ("win",)
+
+
+class ThrottledProgress:
+    """
+    Progress callback of Simulation.start that forwards at most one update every `interval` seconds, or every
+    `steps` steps when set, instead of one per step: `callback` receives the latest event, `batch_callback` every
+    event since the previous update. The end of the game is always delivered, and flush() delivers what is pending.
+    """
+
+    def __init__(self, callback: Callable[[int, int, str], None] | None = None,
+                 batch_callback: Callable[[list[ProgressEvent]], None] | None = None,
+                 interval: float = 0.05, steps: int | None = None):
+        self._callback = callback
+        self._batch_callback = batch_callback
+        self._interval = interval
+        self._steps = steps
+        self._pending: list[ProgressEvent] = []
+        self._last_update = float('-inf')
+
+    def __call__(self, step: int, player: int, move: str):
+        self._pending.append((step, player, move))
+        if (move in FINAL_EVENTS
+                or time.monotonic() - self._last_update >= self._interval
+                or (self._steps is not None and len(self._pending) >= self._steps)):
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        (events, self._pending) = (self._pending, [])
+        self._last_update = time.monotonic()
+        if self._callback:
+            self._callback(*events[-1])
+        if self._batch_callback:
+            self._batch_callback(events)
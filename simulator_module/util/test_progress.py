@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from simulator_module.simulator import Simulation
+from simulator_module.test_simulator import fibonacci_config
+from simulator_module.util.logger import Logger
+from simulator_module.util.progress import ThrottledProgress
+
+
+class Test(TestCase):
+
+    def test_updates_are_coalesced(self):
+        updates = []
+        batches = []
+        progress = ThrottledProgress(lambda *event: updates.append(event), batches.append, interval=3600, steps=4)
+        for step in range(10):
+            progress(step, step % 2, "UP")
+        progress(10, 0, "win")
+
+        # The first step goes out at once, then every 4 steps, and the end of the game
+        self.assertEqual([update[0] for update in updates], [0, 4, 8, 10])
+        self.assertEqual([event[0] for batch in batches for event in batch], list(range(11)))
+
+    def test_simulation_delivers_the_last_step(self):
+        events = []
+        simulation = Simulation(fibonacci_config(), False, Logger())
+        simulation.start(ThrottledProgress(batch_callback=events.extend, interval=3600))
+        self.assertEqual(events[-1][2], "win")
+        self.assertEqual(len(events), len(simulation.game.get_states()) + 1)
@@ -5,7 +5,7 @@ from PySide6.QtWidgets import QWidget, QLabel, QVBoxLayout, QHBoxLayout, QSplitt
 from ui_module.core.main_window.pages.analyse_page_widgets.board_game_widget import BoardGameWidget
 from ui_module.core.main_window.pages.analyse_page_widgets.logs_widget import LogsWidget
 from ui_module.core.main_window.pages.analyse_page_widgets.players_settings_widget import PlayersSettingsWidget
-from ui_module.utils.world import absolute_path_str, World
+from ui_module.utils.world import absolute_path_str
 from ui_module.utils.qt.qt_utils import put_in_frame
 
 class AnalysePage(QWidget):
@@ -42,8 +42,6 @@ class AnalysePage(QWidget):
 
         self.logs_widget.group_id_changed.connect(self.board_game_widget.set_group_id_overlay)
 
-        World().simulator.finished.connect(self.logs_widget.fill_texts)
-
         bottom_widget = QWidget()
         bottom_layout = QHBoxLayout()
         bottom_layout.setContentsMargins(0, 0, 0, 0)
@@ -81,6 +79,7 @@ class AnalysePage(QWidget):
         right_layout.addWidget(put_in_frame(self.players_settings_widget))
 
         self.players_settings_widget.start_simulation.connect(self.board_game_widget.simulator_started)
+        self.players_settings_widget.open_replay.connect(self.board_game_widget.replay_opened)
 
         right_widget.setLayout(right_layout)
 
@@ -1,6 +1,6 @@
 from PySide6.QtCore import Qt, QSize, QTimer, QRectF, Signal
 from PySide6.QtGui import QColor, QPainter, QPen, QBrush, QLinearGradient
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QSlider, QHBoxLayout, QPushButton, QLabel, QSpinBox
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QSlider, QHBoxLayout, QPushButton, QLabel, QSpinBox, QMessageBox
 
 from ui_module.core.simulator.database import PlayersSettings
 from ui_module.core.simulator.simulator_interface import InputPlayer
@@ -301,6 +301,7 @@ class BoardGameWidget(QWidget):
         self.world = World()
 
         self.game_computed = False
+        self.simulation_running = False
         self.current_step = int(0)
 
         self.main_layout = QVBoxLayout()
@@ -395,6 +396,11 @@ class BoardGameWidget(QWidget):
         self.play_btn.clicked.connect(self.on_play_pause)
         self.speed_spin.valueChanged.connect(self.on_speed_changed)
 
+        # Connected once: updates of a simulation that is not running are ignored
+        self.world.simulator.advancement.connect(self.simulator_progress)
+        self.world.simulator.steps_available.connect(self.simulator_steps_available)
+        self.world.simulator.finished.connect(self.simulator_finished)
+
         self.setLayout(self.main_layout)
 
         self.stop_signals = True
@@ -416,7 +422,9 @@ class BoardGameWidget(QWidget):
         v = self.timeline_slider.value() + 1
 
         if v > self.timeline_slider.maximum():
-            self.stop_play()
+            # While the simulation runs, playback waits for the next steps
+            if not self.simulation_running:
+                self.stop_play()
             return
 
         self.stop_signals = True
@@ -557,8 +565,7 @@ class BoardGameWidget(QWidget):
 
     def simulator_started(self):
         self.game_computed = False
-        self.world.simulator.advancement.connect(self.simulator_progress)
-        self.world.simulator.finished.connect(self.simulator_finished)
+        self.simulation_running = True
         self.game_widget.start_loading()
         self._enable_widgets()
 
@@ -575,14 +582,51 @@ class BoardGameWidget(QWidget):
                 )
         self.world.simulator.start_simulation(input_players, self.world.ui_settings.get_keep_logs())
 
+    def replay_opened(self, path: str):
+        if self.simulation_running:
+            return
+        self.stop_play()
+        try:
+            self.world.simulator.open_replay(path)
+        except Exception as e:
+            QMessageBox.warning(self, "Open replay", f"Cannot open {path}: {e}")
+            return
+        self.game_computed = True
+        self.set_max_steps(self.world.simulator.get_total_step_number())
+        self._enable_widgets()
+        self.set_value(0)
+
     def simulator_progress(self, percent):
+        if not self.simulation_running:
+            return
         self.game_widget.set_progress(percent)
 
+    def simulator_steps_available(self, steps: int):
+        """ Steps already played are shown and can be scrubbed while the next ones are computed """
+        if steps == 0 or not self.simulation_running:
+            return
+        self.set_max_steps(steps)
+        if not self.game_computed:
+            self.game_computed = True
+            self.game_widget.stop_loading()
+            self.stop_signals = True
+            self.set_value(0)
+            self.stop_signals = False
+            self.start_play()
+        else:
+            self._enable_widgets()
+
     def simulator_finished(self):
+        if not self.simulation_running:
+            return
+        self.simulation_running = False
         if not self.game_computed:
             self.game_computed = True
             self.set_max_steps(self.world.simulator.get_total_step_number())
             self.game_widget.stop_loading()
             self._enable_widgets()
             self.set_value(0)
-            self.start_play()
\ No newline at end of file
+            self.start_play()
+        else:
+            self.set_max_steps(self.world.simulator.get_total_step_number())
+            self._enable_widgets()
\ No newline at end of file
@@ -98,24 +98,6 @@ class LogsWidget(QWidget):
 
         self.world = World()
 
-        # step -> (player_id, text)
-        self.logs_by_step: dict[int, tuple[int, str]] = {}
-
-    # -----------------------------------------------------
-
-    def fill_texts(self):
-
-        self.logs_by_step.clear()
-
-        total_steps = self.world.simulator.get_total_step_number()
-
-        for step in range(total_steps):
-            step_details = self.world.simulator.get_step_details(step)
-            if not step_details.logs:
-                continue
-            text = "\n".join(step_details.logs)
-            self.logs_by_step[step] = (step_details.player_id, text)
-
     # -----------------------------------------------------
 
     def _combo_box_changed(self, index):
@@ -126,14 +108,16 @@ class LogsWidget(QWidget):
 
     def highlight_step(self, step: int):
 
-        if step not in self.logs_by_step:
+        # Logs are only read when their step is shown: a replay decodes them from its file
+        step_details = self.world.simulator.get_step_details(step)
+        if step_details is None or not step_details.logs:
             self.text_edit.clear()
             return
 
-        player_id, text = self.logs_by_step[step]
+        player_id = step_details.player_id
+        text = "\n".join(step_details.logs)
 
         group_ids = ["Default"]
-        step_details = self.world.simulator.get_step_details(step)
         for instruction_set in step_details.instructions:
             if instruction_set.get_group_id() is not None:
                 group_ids.append(instruction_set.get_group_id())
@@ -163,7 +147,7 @@ class LogsWidget(QWidget):
                     PLAYER {player_id + 1}
                 </span>
                 <span>
-                    (decision time: {step_details.duration*1000:.3f} ms)
+                    (decision time: {step_details.duration*1000:.3f} ms on CodinGame)
                 </span>
             </div>
 
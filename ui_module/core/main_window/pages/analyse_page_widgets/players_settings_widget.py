@@ -7,6 +7,7 @@ from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QL
 
 from dataclasses import dataclass
 
+from simulator_module.replay import REPLAY_EXTENSION
 from ui_module.utils.qt.collapsable_widget import CollapsableWidget
 from ui_module.utils.qt.qt_utils import set_tron_button_style, put_in_frame, set_tron_spinbox_style, \
     set_tron_checkbox_style
@@ -28,6 +29,7 @@ class PlayerUI:
 class PlayersSettingsWidget(QWidget):
 
     start_simulation = Signal()
+    open_replay = Signal(str)
 
     def __init__(self):
         super().__init__()
@@ -106,6 +108,10 @@ class PlayersSettingsWidget(QWidget):
         self.start_layout.addStretch()
         set_tron_button_style(self.start_button)
         self.start_layout.addWidget(self.start_button)
+        self.replay_button = QPushButton(" Open Replay ")
+        set_tron_button_style(self.replay_button)
+        self.replay_button.setToolTip("Show a game saved with the logs.")
+        self.start_layout.addWidget(self.replay_button)
         self.start_layout.addStretch()
 
         self.layout.addLayout(self.start_layout)
@@ -116,6 +122,7 @@ class PlayersSettingsWidget(QWidget):
         self._load_database()
         self.keep_logs_checkbox.clicked.connect(self._keep_logs_checked)
         self.start_button.clicked.connect(self._start_simulation)
+        self.replay_button.clicked.connect(self._open_replay)
 
     def create_player_widget(self, index: int, default_color: QColor) -> PlayerUI:
         widget = QWidget()
@@ -391,5 +398,15 @@ class PlayersSettingsWidget(QWidget):
     def _start_simulation(self):
         self.start_simulation.emit()
 
+    def _open_replay(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open replay",
+            "logs" if os.path.isdir("logs") else "",
+            f"Tron replays (*{REPLAY_EXTENSION});;All Files (*)"
+        )
+        if path:
+            self.open_replay.emit(path)
+
     def _keep_logs_checked(self):
         self.world.ui_settings.set_keep_logs(self.keep_logs_checkbox.isChecked())
\ No newline at end of file
@@ -0,0 +1,64 @@
+import os
+from unittest import TestCase, mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from simulator_module.test_simulator import SCRIPTS_DIRECTORY
+from ui_module.core.main_window.pages.analyse_page_widgets.board_game_widget import BoardGameWidget
+from ui_module.utils.world import World
+
+FIBONACCI = os.path.join(SCRIPTS_DIRECTORY, 'fibonacci.py')
+PLAYERS = {0: (3, 10), 1: (20, 10)}
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        world = World()
+        simulator = world.simulator
+        # The simulation runs in the test thread: its signals are delivered at once
+        patches = [
+            mock.patch.object(simulator, 'start_simulation',
+                              lambda players, _keep_logs: simulator._start_simulation(players)),
+            mock.patch.object(simulator, '_keep_log_files', False),
+            mock.patch.object(world.player_settings, 'get_enable', lambda i: i in PLAYERS),
+            mock.patch.object(world.player_settings, 'get_ai_path', lambda i: FIBONACCI),
+            mock.patch.object(world.player_settings, 'get_random_pos', lambda i: False),
+            mock.patch.object(world.player_settings, 'get_position', lambda i: PLAYERS.get(i, (0, 0))),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_steps_are_shown_while_the_simulation_runs(self):
+        finished = mock.patch.object(BoardGameWidget, 'simulator_finished', autospec=True,
+                                     side_effect=BoardGameWidget.simulator_finished)
+        simulator_finished = finished.start()
+        self.addCleanup(finished.stop)
+        widget = BoardGameWidget()
+        available_steps = []
+        World().simulator.steps_available.connect(available_steps.append)
+        self.addCleanup(World().simulator.steps_available.disconnect, available_steps.append)
+
+        # A second run goes through the same connections
+        for run in range(2):
+            available_steps.clear()
+            widget.simulator_started()
+            total_steps = World().simulator.get_total_step_number()
+
+            self.assertEqual(simulator_finished.call_count, run + 1)
+            self.assertFalse(widget.simulation_running)
+            self.assertTrue(widget.game_computed)
+            self.assertEqual(available_steps[0], 0)
+            self.assertEqual(available_steps[-1], total_steps)
+            self.assertEqual(available_steps[1:], sorted(available_steps[1:]))
+            self.assertEqual(widget.max_steps, total_steps)
+            self.assertIsNotNone(World().simulator.get_board_at(total_steps - 1))
+            self.assertIsNone(World().simulator.get_board_at(total_steps))
+        widget.stop_play()
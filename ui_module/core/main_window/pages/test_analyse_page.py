@@ -0,0 +1,44 @@
+import os
+import tempfile
+from unittest import TestCase, mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from simulator_module.replay import ReplayReader
+from simulator_module.simulator import Simulation
+from simulator_module.test_simulator import fibonacci_config
+from simulator_module.util.logger import QuietLogger
+from ui_module.core.main_window.pages.analyse_page import AnalysePage
+from ui_module.utils.world import World
+
+
+class Test(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_replay_steps_are_decoded_when_shown(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        config = fibonacci_config()
+        config.replay_file = os.path.join(directory.name, 'game.tronreplay')
+        simulation = Simulation(config, False, QuietLogger())
+        simulation.start()
+
+        page = AnalysePage()
+        with mock.patch.object(ReplayReader, 'get_stderr_at_step', autospec=True,
+                               side_effect=ReplayReader.get_stderr_at_step) as get_stderr_at_step:
+            page.board_game_widget.replay_opened(config.replay_file)
+            self.assertEqual(World().simulator.get_total_step_number(), len(simulation.game.get_states()))
+            # Step 0 is shown: it has no logs
+            self.assertEqual(get_stderr_at_step.call_count, 0)
+
+            page.board_game_widget.set_value(5)
+            self.assertEqual(get_stderr_at_step.call_count, 1)
+            player_turn = simulation.game.get_player_turn_at_step(5)
+            logs = [log for log in simulation.get_logs_at(5, player_turn.player_id) if log.strip()]
+            for log in logs:
+                self.assertIn(log, page.logs_widget.text_edit.toPlainText())
@@ -1,33 +1,55 @@
 from instruction_parser_module import parser
 from simulator_module.config import Config
+from simulator_module.replay import ReplayReader
 from simulator_module.simulator import Simulation
+from simulator_module.util.progress import ThrottledProgress
 from ui_module.core.simulator.simulator_interface import SimulatorInterface, OutputBoard, OutputPlayer, InputPlayer, \
     StepDetails
 
+# Bytes of stderr kept in memory per AI, chatty bots (e.g. drawing with #PAINT) are spilled to disk beyond that
+LOG_MEMORY_BUDGET = 16 * 1024 * 1024
+# Seconds between two progress updates of a running simulation
+PROGRESS_INTERVAL = 0.05
 
 class Simulator(SimulatorInterface):
 
     simulation: Simulation
+    # Game shown: the simulation, or a replay opened from a file
+    _source: Simulation | ReplayReader | None
 
     _running: bool
-    _step_details: list[StepDetails|None]
+    # Append-only step feed, filled by the simulation thread as steps are played: only the first _available_steps
+    # entries are read by the GUI thread. Entries of a replay are None until shown, and decoded by the GUI thread.
+    _step_details: list[StepDetails | None]
+    _boards: list[OutputBoard | None]
+    _available_steps: int
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.ui_to_simulator_player_mapping = {}
         self.simulator_to_ui_player_mapping = {}
+        self._source = None
         self._running = False
         self._step_details = []
+        self._boards = []
+        self._available_steps = 0
 
     def _start_simulation(self, players: list[InputPlayer]):
 
         self.ui_to_simulator_player_mapping = {}
         self.simulator_to_ui_player_mapping = {}
         self._running = True
+        self._available_steps = 0
         self._step_details = []
+        self._boards = []
+        self.steps_available.emit(0)
+        self._close_source()
 
         config = {
-            "ais": []
+            "ais": [],
+            "log_memory_budget": LOG_MEMORY_BUDGET,
+            "compress_logs": True,
+            "calibrate_host": True
         }
         for index, player in enumerate(players):
             player_config : dict = {
@@ -40,70 +62,106 @@ class Simulator(SimulatorInterface):
             self._map_user(player.id, index)
 
         self.simulation = Simulation(Config(config), self._keep_log_files)
-        self.simulation.start(lambda turn, _, _2 : self.advancement.emit(turn/9.5))
-        self._compute_all_step_details()
+        self._source = self.simulation
+        # One update per PROGRESS_INTERVAL at most: a signal per step floods the GUI event loop
+        self.simulation.start(ThrottledProgress(lambda turn, _, _2 : self.advancement.emit(turn/9.5),
+                                                lambda _: self._feed_steps(), interval=PROGRESS_INTERVAL))
+        self._feed_steps()
         self._running = False
         self.finished.emit()
 
+    def open_replay(self, path: str):
+        """ Shows a saved game (see ReplayWriter): its steps are only decoded when displayed """
+        replay = ReplayReader(path)
+        self._close_source()
+        self._source = replay
+
+        self.ui_to_simulator_player_mapping = {}
+        self.simulator_to_ui_player_mapping = {}
+        for player in range(len(replay.initial_coords)):
+            self._map_user(player, player)
+
+        self._available_steps = 0
+        self.steps_available.emit(0)
+        self._step_details = [None] * len(replay)
+        self._boards = [None] * len(replay)
+        self._available_steps = len(replay)
+        self.steps_available.emit(self._available_steps)
+
+    def _close_source(self):
+        # Releases the logs of the game shown before, its steps are not read anymore
+        if self._source is not None:
+            self._source.close()
+            self._source = None
+
     def _map_user(self, player_ui_id: int, player_simulator_id: int):
         self.ui_to_simulator_player_mapping[player_ui_id] = player_simulator_id
         self.simulator_to_ui_player_mapping[player_simulator_id] = player_ui_id
 
     def get_total_step_number(self) -> int:
-        if self._running:
-            return 0
-        return len(self.simulation.game.get_states())
+        return self._available_steps
 
     def get_board_at(self, step: int) -> OutputBoard | None:
-        if self._running:
+        # The lists are replaced when a new simulation starts: the one read is the one bounds are checked against
+        boards = self._boards
+        if not 0 <= step < min(self._available_steps, len(boards)):
+            return None
+        if boards[step] is None:
+            boards[step] = self._compute_board(self._source.game.get_states()[step])
+        return boards[step]
+
+    def get_step_details(self, step: int) -> StepDetails | None:
+        step_details = self._step_details
+        if not 0 <= step < min(self._available_steps, len(step_details)):
             return None
-        state_at_step = self.simulation.game.get_states()[step]
+        if step_details[step] is None:
+            step_details[step] = self._compute_step_details(step)
+        return step_details[step]
+
+    def _feed_steps(self):
+        """ Publishes the steps played since the last call, from the simulation thread """
+        states = self.simulation.game.get_states()
+        for step in range(len(self._step_details), len(states)):
+            self._boards.append(self._compute_board(states[step]))
+            self._step_details.append(self._compute_step_details(step))
+        if len(self._step_details) != self._available_steps:
+            self._available_steps = len(self._step_details)
+            self.steps_available.emit(self._available_steps)
+
+    def _compute_board(self, state) -> OutputBoard:
         output_board = OutputBoard()
         for player_ui_id, player_id in self.ui_to_simulator_player_mapping.items():
-            head = state_at_step.get_head(player_id)
-            trail = state_at_step.get_trail(player_id)
+            head = state.get_head(player_id)
+            trail = state.get_trail(player_id)
             output_board.players.append(OutputPlayer(player_ui_id, head, trail))
-
         return output_board
 
-    def get_step_details(self, step: int) -> StepDetails | None:
-        if self._running or step >= self.get_total_step_number():
-            return None
-        else:
-            return self._step_details[step]
-
-    def _compute_all_step_details(self):
-        if not self._running:
-            return
-        for step in range(len(self.simulation.game.get_states())):
-            step_details = self._compute_step_details(step)
-            self._step_details.append(step_details)
-
     def _compute_step_details(self, step: int) -> StepDetails:
-        player_turn = self.simulation.game.get_player_turn_at_step(step)
+        player_turn = self._source.game.get_player_turn_at_step(step)
         player_ui_id = self.simulator_to_ui_player_mapping.get(player_turn.player_id)
-        raw_logs = self.simulation.get_logs_at(step, player_turn.player_id)
+        raw_logs = self._source.get_logs_at(step, player_turn.player_id)
         instructions = parser.parse_logs(raw_logs)
         logs = parser.filter_logs(raw_logs)
 
-        step_details = StepDetails(step, player_turn.turn, player_ui_id, player_turn.duration, player_turn.move, logs,
-                                   instructions)
+        # Decision time as it would be on CodinGame, the host being calibrated
+        duration = player_turn.codingame_ms / 1000
+        step_details = StepDetails(step, player_turn.turn, player_ui_id, duration, player_turn.move, logs, instructions)
         return step_details
 
     def get_player_stdout_at(self, step: int, player_id: int) -> str:
         return f"Not implemented yet: get_player_stdout_at({step}, {player_id})"
 
     def get_player_stderr_at(self, step: int, player_id: int) -> list[str]:
-        if self._running:
-            return []
         player_simulator_id = self.ui_to_simulator_player_mapping.get(player_id)
         step_details = self.get_step_details(step)
+        if step_details is None:
+            return []
         return step_details.logs if step_details.player_id == player_simulator_id else []
 
     def get_winner(self) -> int:    # return winner's player_id
         if self._running:
             return -1
-        winner_id = self.simulation.game.get_winner()
+        winner_id = self._source.game.get_winner()
         if winner_id == -1:
             return -1
         else:
@@ -116,4 +174,4 @@ class Simulator(SimulatorInterface):
         if player_simulator_id is None:
             return -1
 
-        return self.simulation.game.get_player_death_state_index(player_simulator_id)
+        return self._source.game.get_player_death_state_index(player_simulator_id)
@@ -24,7 +24,7 @@ class OutputPlayer:
 class OutputBoard:
     players: list[OutputPlayer] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class StepDetails:
     step: int
     turn: int
@@ -54,6 +54,7 @@ class SimulatorInterface(QObject, ABC, metaclass=MetaSimulatorInterface):
 
     # Signals
     advancement = Signal(float)     # The value should be in [float(0), float(100)].
+    steps_available = Signal(int)   # Number of steps that can be shown while the simulation runs, 0 when it starts.
     finished = Signal()             # Send this signal when the simulation is ready for all the abstract methods (except for start_simulation).
 
     def __init__(self, parent=None):